@@ -1,3 +1,16 @@
 """
 Agents module initialization.
+
+Submodules are resolved lazily on first attribute access (e.g. `src.agents.travel`),
+so importing the package does not pull in every agent's tools and clients.
 """
+
+import importlib
+
+__all__ = ["medicine", "supervisor", "travel"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,34 +7,72 @@ This module provides tools for:
 - Simulating pharmacy calls (with human-in-the-loop confirmation)
 """
 
+import asyncio
+import functools
 import logging
 import random
+import threading
 import time
 import os
-import json
 from typing import Optional, Annotated
+import orjson
+from cachetools import TTLCache
 from langchain_core.tools import tool, InjectedToolCallId
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_openai import ChatOpenAI
+from langgraph.prebuilt import InjectedState
+from langgraph.types import Command
 from pydantic import BaseModel, Field
 
-# CopilotKit imports for streaming state
-from copilotkit.langgraph import copilotkit_emit_state, copilotkit_customize_config
-
 logger = logging.getLogger(__name__)
 
 # Import web search utilities
-from src.utils.web_search import search_pharmacies_web, search_medicine_availability
+from src.utils.web_search import asearch_pharmacies_web, asearch_medicine_availability
 
 
+@functools.lru_cache(maxsize=1)
 def get_pharmacy_llm():
     """Get LLM instance for pharmacy data synthesis."""
+    from langchain_openai import ChatOpenAI
+    
     return ChatOpenAI(
         model="gpt-4o-mini",
         temperature=0.3,  # Lower temp for more consistent structured output
     )
 
 
+@functools.lru_cache(maxsize=1)
+def get_pharmacy_extractor():
+    """Get the structured-output LLM that turns pharmacy research into PharmacySearchResponse."""
+    return get_pharmacy_llm().with_structured_output(PharmacySearchResponse)
+
+
+# Cache of structured pharmacy search results (web search + LLM synthesis).
+# Repeat searches for the same medicine/location skip both network round-trips.
+_pharmacy_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+_pharmacy_cache_lock = threading.Lock()
+
+
+def _normalize_query(text: str) -> str:
+    """Normalize free-text query parts so trivial variations share a cache entry."""
+    return " ".join(text.lower().split())
+
+
+def _pharmacy_cache_key(medicine_name: str, location: str, radius_km: float) -> tuple:
+    """Build the cache key for a pharmacy search."""
+    return (_normalize_query(medicine_name), _normalize_query(location), round(radius_km, 1))
+
+
+# How long a search stored in conversation state is reused for follow-ups
+LAST_SEARCH_MAX_AGE_SECONDS = 600
+
+
+def clear_pharmacy_cache() -> None:
+    """Drop all cached pharmacy search results."""
+    with _pharmacy_cache_lock:
+        _pharmacy_cache.clear()
+
+
 # System prompt for the medicine agent
 MEDICINE_SYSTEM_PROMPT = """You are a helpful medicine finder assistant. Your PRIMARY goal is to ask follow-up questions to gather ALL required information BEFORE taking any action.
 
@@ -60,6 +98,7 @@ MEDICINE_SYSTEM_PROMPT = """You are a helpful medicine finder assistant. Your PR
 
 ## IMPORTANT:
 - NEVER search without knowing both medicine AND location
+- When checking 2+ pharmacies, prefer check_availability_batch over repeated check_availability calls
 - Be conversational and empathetic - finding medicine can be stressful
 - Confirm details before taking action: "Just to confirm, you're looking for X near Y?"
 - For pharmacy calls, remind the user that this is a SIMULATED call for demonstration purposes
@@ -67,6 +106,43 @@ MEDICINE_SYSTEM_PROMPT = """You are a helpful medicine finder assistant. Your PR
 - Availability checking and pharmacy calls are simulated for demonstration."""
 
 
+# System prompt for structuring pharmacy research into JSON
+PHARMACY_SYNTHESIS_SYSTEM_PROMPT = """You extract structured pharmacy data from web research about pharmacies.
+
+Extract UP TO 5 pharmacies from the research. Use REAL pharmacy names and addresses from the research provided.
+If specific details are not available, use reasonable estimates or "Contact for details"."""
+
+_PHARMACY_SYNTHESIS_SYSTEM_MESSAGE = SystemMessage(content=PHARMACY_SYNTHESIS_SYSTEM_PROMPT)
+
+# Per-search input for the synthesis LLM, filled with str.format_map
+PHARMACY_SYNTHESIS_INPUT_TEMPLATE = """PHARMACY RESEARCH:
+{info}
+
+ADDITIONAL SOURCE CONTEXT:
+{context}
+
+SEARCH DETAILS:
+- Medicine: {medicine}
+- Location: {location}"""
+
+
+class Pharmacy(BaseModel):
+    """A pharmacy extracted from web research."""
+    name: str = Field(description="Pharmacy name")
+    address: str = Field(description="Full address, or 'Near [location]'")
+    phone: str = Field(description="Phone number, or 'Contact via website'")
+    hours: str = Field(description="Operating hours, or 'Check website for hours'")
+    has_medicine: bool = Field(description="Whether the research suggests the medicine is stocked")
+    notes: str = Field(description="Any special notes about this pharmacy")
+
+
+class PharmacySearchResponse(BaseModel):
+    """Schema for the pharmacy synthesis LLM output."""
+    pharmacies: list[Pharmacy] = Field(description="Up to 5 pharmacies from the research")
+    total_found: int = Field(description="Number of pharmacies found")
+    search_summary: str = Field(description="Brief summary of what was found")
+
+
 class PharmacyResult(BaseModel):
     """A pharmacy search result."""
     id: str
@@ -102,11 +178,13 @@ class CallResult(BaseModel):
 
 
 @tool
-def search_pharmacies(
+async def search_pharmacies(
     medicine_name: str,
     location: str,
+    state: Annotated[dict, InjectedState],
+    tool_call_id: Annotated[str, InjectedToolCallId],
     radius_km: float = 5.0,
-) -> dict:
+) -> dict | Command:
     """
     Search for pharmacies near a location that might have a specific medicine.
     Uses Tavily web search to find real pharmacy data, then internal LLM to structure it.
@@ -124,9 +202,27 @@ def search_pharmacies(
     logger.debug(f"  Location: {location}")
     logger.debug(f"  Radius: {radius_km}km")
     
+    # Reuse this conversation's last search for follow-ups about the same pharmacies
+    search_key = [_normalize_query(medicine_name), _normalize_query(location)]
+    last_search = (state.get("agent_outputs") or {}).get("last_pharmacy_search")
+    if (
+        last_search
+        and last_search.get("key") == search_key
+        and time.time() - last_search.get("timestamp", 0) < LAST_SEARCH_MAX_AGE_SECONDS
+    ):
+        logger.debug("  Reusing pharmacy search from conversation state (cached)")
+        return {**last_search["result"], "cached": True}
+    
+    cache_key = _pharmacy_cache_key(medicine_name, location, radius_km)
+    with _pharmacy_cache_lock:
+        cached = _pharmacy_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("  Cache hit - returning cached pharmacy results")
+        return _remember_search(tool_call_id, search_key, cached)
+    
     # Call Tavily web search to get pharmacy research
     logger.debug("  Calling Tavily web search...")
-    web_results = search_pharmacies_web(medicine_name, location, radius_km)
+    web_results = await asearch_pharmacies_web(medicine_name, location, radius_km)
     
     if not web_results.get("success"):
         error_msg = web_results.get("error", "Unknown error occurred")
@@ -146,86 +242,48 @@ def search_pharmacies(
     # Use internal LLM to synthesize structured pharmacy data
     logger.debug("  Synthesizing structured pharmacy data with LLM...")
     
-    llm = get_pharmacy_llm()
-    
     # Format source snippets for additional context
-    source_content = "\n".join([s.get("snippet", "") for s in sources if s.get("snippet")])
+    source_content = "\n".join(snippet for s in sources if (snippet := s.get("snippet")))
     
-    synthesis_prompt = f"""Based on this research about pharmacies, extract structured pharmacy data.
-
-PHARMACY RESEARCH:
-{pharmacy_info}
-
-ADDITIONAL SOURCE CONTEXT:
-{source_content[:2000]}
-
-SEARCH DETAILS:
-- Medicine: {medicine_name}
-- Location: {location}
-
-Extract UP TO 5 pharmacies from the research. Use REAL pharmacy names and addresses from the research above.
-If specific details are not available, use reasonable estimates or "Contact for details".
-
-Return ONLY valid JSON (no markdown, no explanation) in this exact format:
-{{
-  "pharmacies": [
-    {{
-      "id": "pharmacy_1",
-      "name": "Pharmacy Name",
-      "address": "Full address or 'Near [location]'",
-      "phone": "Phone number or 'Contact via website'",
-      "hours": "Operating hours or 'Check website for hours'",
-      "distance_km": 1.5,
-      "rating": 4.2,
-      "is_open": true,
-      "has_medicine": true,
-      "estimated_price": 25.00,
-      "notes": "Any special notes about this pharmacy"
-    }}
-  ],
-  "total_found": 5,
-  "search_summary": "Brief summary of what was found"
-}}
-
-Make distance_km values between 0.5 and {radius_km}. Make ratings between 3.5 and 4.9."""
+    # Static instructions go in the system message so the prompt prefix is
+    # identical across calls; only the research and search details vary.
+    synthesis_input = PHARMACY_SYNTHESIS_INPUT_TEMPLATE.format_map({
+        "info": pharmacy_info,
+        "context": source_content[:2000],
+        "medicine": medicine_name,
+        "location": location,
+    })
     
     try:
-        response = llm.invoke(synthesis_prompt)
-        response_text = response.content.strip()
-        
-        # Clean up response - remove markdown code blocks if present
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-            response_text = response_text.strip()
-        
-        pharmacy_data = json.loads(response_text)
+        extraction = await get_pharmacy_extractor().ainvoke([
+            _PHARMACY_SYNTHESIS_SYSTEM_MESSAGE,
+            HumanMessage(content=synthesis_input),
+        ])
         
-        # Ensure IDs are set
-        for idx, pharmacy in enumerate(pharmacy_data.get("pharmacies", [])):
-            pharmacy["id"] = pharmacy.get("id") or f"pharmacy_{idx + 1}"
+        # Set IDs and fill in the simulated details
+        pharmacies = []
+        for idx, pharmacy in enumerate(extraction.pharmacies):
+            pharmacy = pharmacy.model_dump()
+            pharmacy["id"] = f"pharmacy_{idx + 1}"
             pharmacy["from_web_search"] = True
+            _add_simulated_details(pharmacy, radius_km)
+            pharmacies.append(pharmacy)
         
-        logger.debug(f"  SUCCESS: Extracted {len(pharmacy_data.get('pharmacies', []))} pharmacies")
+        logger.debug(f"  SUCCESS: Extracted {len(pharmacies)} pharmacies")
         
-        return {
+        result = {
             "success": True,
             "medicine_name": medicine_name,
             "location": location,
-            "pharmacies": pharmacy_data.get("pharmacies", []),
-            "total_found": pharmacy_data.get("total_found", len(pharmacy_data.get("pharmacies", []))),
-            "search_summary": pharmacy_data.get("search_summary", f"Found pharmacies near {location} for {medicine_name}"),
-            "message": f"Found {len(pharmacy_data.get('pharmacies', []))} pharmacies near {location}. Check the left panel for details.",
+            "pharmacies": pharmacies,
+            "total_found": extraction.total_found or len(pharmacies),
+            "search_summary": extraction.search_summary or f"Found pharmacies near {location} for {medicine_name}",
+            "message": f"Found {len(pharmacies)} pharmacies near {location}. Check the left panel for details.",
         }
+        with _pharmacy_cache_lock:
+            _pharmacy_cache[cache_key] = result
+        return _remember_search(tool_call_id, search_key, result)
         
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse pharmacy JSON: {e}")
-        logger.error(f"Response was: {response_text[:500]}...")
-        return {
-            "error": True,
-            "message": "Failed to process pharmacy data. Please try again.",
-        }
     except Exception as e:
         logger.error(f"Error synthesizing pharmacy data: {e}")
         return {
@@ -234,8 +292,67 @@ Make distance_km values between 0.5 and {radius_km}. Make ratings between 3.5 an
         }
 
 
+def _remember_search(tool_call_id: str, search_key: list[str], result: dict) -> Command:
+    """Return the search result and store it in the agent state for follow-up turns."""
+    return Command(update={
+        "agent_outputs": {
+            "last_pharmacy_search": {
+                "key": search_key,
+                "timestamp": time.time(),
+                "result": result,
+            },
+        },
+        "messages": [
+            ToolMessage(content=orjson.dumps(result).decode(), tool_call_id=tool_call_id),
+        ],
+    })
+
+
+def _add_simulated_details(pharmacy: dict, radius_km: float) -> None:
+    """Fill in simulated distance, rating, open status and price for a pharmacy."""
+    pharmacy["distance_km"] = round(random.uniform(0.5, max(radius_km, 0.5)), 1)
+    pharmacy["rating"] = round(random.uniform(3.5, 4.9), 1)
+    pharmacy["is_open"] = random.random() > 0.2
+    pharmacy["estimated_price"] = round(random.uniform(5, 25), 2)
+
+
+def _simulate_availability(
+    pharmacy_id: str,
+    medicine_name: str,
+    pharmacy_name: str,
+    web_data: Optional[dict],
+) -> dict:
+    """Build a simulated availability result, enriched with web search data if any."""
+    # Use provided pharmacy_name or generate from ID
+    if not pharmacy_name:
+        pharmacy_name = f"Pharmacy {pharmacy_id}"
+    
+    # Simulate availability (70% chance of having stock)
+    in_stock = random.random() > 0.3
+    quantity = random.randint(5, 100) if in_stock else 0
+    price = round(random.uniform(5, 25), 2) if in_stock else None
+    
+    result = {
+        "pharmacy_id": pharmacy_id,
+        "pharmacy_name": pharmacy_name,
+        "medicine": medicine_name,
+        "in_stock": in_stock,
+        "quantity": quantity,
+        "price_per_unit": price,
+        "message": f"{'✅ In stock' if in_stock else '❌ Out of stock'} at {pharmacy_name}",
+        "note": "⚠️ Availability is simulated for demonstration. Call pharmacy to confirm actual stock.",
+    }
+    
+    # Add web search data if available
+    if web_data:
+        result["web_search_info"] = web_data.get("search_content", "")
+        result["sources"] = web_data.get("sources", [])
+    
+    return result
+
+
 @tool
-def check_availability(
+async def check_availability(
     pharmacy_id: str,
     medicine_name: str,
     pharmacy_name: str = "",
@@ -264,7 +381,7 @@ def check_availability(
     # Try web search for real availability/pricing info
     if pharmacy_name and location:
         logger.debug(f"  Searching web for availability info...")
-        web_result = search_medicine_availability(pharmacy_name, medicine_name, location)
+        web_result = await asearch_medicine_availability(pharmacy_name, medicine_name, location)
         if web_result.get("success"):
             logger.debug(f"  Found web data for {medicine_name}")
             web_data = web_result
@@ -272,38 +389,68 @@ def check_availability(
             logger.debug(f"  No web data found, using simulation")
     
     # Simulate API delay
-    time.sleep(0.3)
+    await asyncio.sleep(0.3)
     
-    # Use provided pharmacy_name or generate from ID
-    if not pharmacy_name:
-        pharmacy_name = f"Pharmacy {pharmacy_id}"
+    return _simulate_availability(pharmacy_id, medicine_name, pharmacy_name, web_data)
+
+
+@tool
+async def check_availability_batch(
+    pharmacy_ids: list[str],
+    medicine_name: str,
+    pharmacy_names: Optional[list[str]] = None,
+    location: str = "",
+) -> dict:
+    """
+    Check several pharmacies for a medicine in one call.
+    Runs the web searches for all pharmacies concurrently and simulates availability status.
     
-    # Simulate availability (70% chance of having stock)
-    in_stock = random.random() > 0.3
-    quantity = random.randint(5, 100) if in_stock else 0
-    price = round(random.uniform(5, 25), 2) if in_stock else None
+    Args:
+        pharmacy_ids: The IDs of the pharmacies to check
+        medicine_name: The name of the medicine to check for
+        pharmacy_names: Names of the pharmacies, in the same order as pharmacy_ids (for web search)
+        location: Location for context (for web search)
     
-    result = {
-        "pharmacy_id": pharmacy_id,
-        "pharmacy_name": pharmacy_name,
+    Returns:
+        Availability information for each pharmacy
+    """
+    logger.debug("[TOOL] check_availability_batch called")
+    logger.debug("  Pharmacy IDs: %s", pharmacy_ids)
+    logger.debug("  Medicine: %s", medicine_name)
+    
+    names = list(pharmacy_names or [])
+    names += [""] * (len(pharmacy_ids) - len(names))
+    
+    async def lookup(pharmacy_name: str) -> Optional[dict]:
+        if not (pharmacy_name and location):
+            return None
+        web_result = await asearch_medicine_availability(pharmacy_name, medicine_name, location)
+        return web_result if web_result.get("success") else None
+    
+    # Fan out web searches, overlapping with the simulated API delay
+    logger.debug("  Searching web for %d pharmacies concurrently...", len(pharmacy_ids))
+    *web_data, _ = await asyncio.gather(
+        *(lookup(name) for name in names[:len(pharmacy_ids)]),
+        asyncio.sleep(0.3),
+    )
+    
+    results = [
+        _simulate_availability(pharmacy_id, medicine_name, pharmacy_name, data)
+        for pharmacy_id, pharmacy_name, data in zip(pharmacy_ids, names, web_data)
+    ]
+    in_stock_count = sum(1 for r in results if r["in_stock"])
+    
+    return {
+        "success": True,
         "medicine": medicine_name,
-        "in_stock": in_stock,
-        "quantity": quantity,
-        "price_per_unit": price,
-        "message": f"{'✅ In stock' if in_stock else '❌ Out of stock'} at {pharmacy_name}",
+        "results": results,
+        "message": f"{medicine_name} is in stock at {in_stock_count} of {len(results)} pharmacies",
         "note": "⚠️ Availability is simulated for demonstration. Call pharmacy to confirm actual stock.",
     }
-    
-    # Add web search data if available
-    if web_data:
-        result["web_search_info"] = web_data.get("search_content", "")
-        result["sources"] = web_data.get("sources", [])
-    
-    return result
 
 
 @tool
-def call_pharmacy(
+async def call_pharmacy(
     pharmacy_id: str,
     pharmacy_name: str,
     medicine_name: str,
@@ -331,7 +478,7 @@ def call_pharmacy(
     
     # Simulate call duration
     logger.debug(f"  Simulating call...")
-    time.sleep(1.0)
+    await asyncio.sleep(1.0)
     
     # Simulate call outcome (80% success rate)
     available = random.random() > 0.2
@@ -391,5 +538,6 @@ def get_medicine_tools():
     return [
         search_pharmacies,
         check_availability,
+        check_availability_batch,
         call_pharmacy,
     ]
@@ -27,17 +27,21 @@ Architecture:
     └─────────────────┘           └─────────────────┘
 """
 
+import functools
 import logging
+import operator
 import os
 import json
+import re
 import warnings
-from typing import Literal, Any, Optional
+from typing import Annotated, Literal, Any, Optional
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
-from langchain_openai import ChatOpenAI
 from langchain_core.runnables import RunnableConfig
 
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import Command
 from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt.chat_agent_executor import AgentState as ReactAgentState
 from langgraph.store.memory import InMemoryStore
 from langgraph.checkpoint.memory import MemorySaver
 from pydantic import BaseModel, Field
@@ -57,10 +61,9 @@ memory_store = InMemoryStore()
 def get_user_preferences(user_id: str) -> dict:
     """Retrieve stored user preferences from memory."""
     try:
-        namespace = (user_id, "preferences")
-        items = list(memory_store.search(namespace))
-        if items:
-            return items[0].value
+        item = memory_store.get((user_id, "preferences"), "user_prefs")
+        if item:
+            return item.value
     except Exception as e:
         logger.warning(f"Could not retrieve user preferences: {e}")
     return {}
@@ -74,12 +77,15 @@ def save_user_preferences(user_id: str, preferences: dict) -> None:
     except Exception as e:
         logger.warning(f"Could not save user preferences: {e}")
 
-from src.agents.medicine import get_medicine_tools, MEDICINE_SYSTEM_PROMPT
-from src.agents.travel import get_travel_tools, TRAVEL_SYSTEM_PROMPT
+# Agent modules (and their Tavily/tool imports) are loaded inside the factories
+# below, so a worker only pays for the agents it actually runs.
 
 
+@functools.lru_cache(maxsize=8)
 def get_llm(temperature: float = 0.7):
     """Get the OpenAI LLM instance."""
+    from langchain_openai import ChatOpenAI
+    
     return ChatOpenAI(
         model="gpt-4o-mini",
         temperature=temperature,
@@ -99,10 +105,20 @@ class AgentState(CopilotKitState):
     # Routing fields
     next_agent: str = ""                    # Which agent to route to
     task_type: str = ""                     # "medicine", "travel", or "general"
-    agent_outputs: dict = {}                # Outputs from each agent
+    agent_outputs: Annotated[dict, operator.or_] = {}  # Outputs from each agent (nodes return deltas)
     iteration: int = 0                      # Track routing iterations
 
 
+class MedicineAgentState(ReactAgentState):
+    """
+    State of the medicine react agent.
+    
+    Carries agent_outputs so tools can reuse earlier results (e.g. the last
+    pharmacy search) across turns.
+    """
+    agent_outputs: Annotated[dict, operator.or_]
+
+
 # =============================================================================
 # ROUTING DECISION SCHEMA
 # =============================================================================
@@ -156,86 +172,187 @@ IMPORTANT:
 - Only use respond_directly for greetings or meta questions
 - Follow-up messages should go to the same agent that handled the original request"""
 
+_ROUTER_SYSTEM_MESSAGE = SystemMessage(content=SUPERVISOR_ROUTER_PROMPT)
+
+
+# Task type recorded in state for each routing target
+AGENT_TASK_TYPES = {
+    "medicine_agent": "medicine",
+    "travel_agent": "travel",
+    "respond_directly": "general",
+}
+
+# Separator line for the per-request debug logs
+_LOG_RULE = "=" * 60
+
+# Graph node that handles each routing target
+AGENT_NODES = {
+    "medicine_agent": "medicine_agent",
+    "travel_agent": "travel_agent",
+    "respond_directly": "direct_response",
+}
+
+# Keyword fast-path: unambiguous messages are routed without the router LLM
+_MEDICINE_RE = re.compile(
+    r"\b(pharmac(?:y|ies|ist)|medicines?|medications?|drugs?|drugstores?|prescriptions?|"
+    r"pills?|tablets?|capsules?|aspirin|ibuprofen|paracetamol|acetaminophen|tylenol|advil|"
+    r"antibiotics?|cvs|walgreens|rite aid)\b",
+    re.IGNORECASE,
+)
+_TRAVEL_RE = re.compile(
+    r"\b(trips?|travel(?:l?ing)?|vacations?|holidays?|itinerar(?:y|ies)|flights?|hotels?|"
+    r"destinations?|sightseeing|getaway)\b",
+    re.IGNORECASE,
+)
+_GREET_RE = re.compile(
+    r"(hi|hello|hey|good (?:morning|afternoon|evening)|thanks|thank you)[.!\s]*",
+    re.IGNORECASE,
+)
+_FOLLOW_UP_RE = re.compile(
+    r"(yes|yeah|yep|sure|ok(?:ay)?|no|nope|please|go ahead|do it|sounds good|"
+    r"(?:check |call )?(?:that|this|the first|the second) one)[.!\s]*",
+    re.IGNORECASE,
+)
+_TASK_AGENTS = {"medicine": "medicine_agent", "travel": "travel_agent"}
+
+
+def _fast_route(user_message: str, task_type: str) -> Optional[str]:
+    """
+    Route high-confidence messages by keyword, without calling the router LLM.
+    
+    Returns the target agent, or None when the message is ambiguous and
+    should go to the LLM router.
+    """
+    if not isinstance(user_message, str):
+        return None
+    text = user_message.strip()
+    
+    if _GREET_RE.fullmatch(text):
+        return "respond_directly"
+    
+    previous_agent = _TASK_AGENTS.get(task_type)
+    if previous_agent and _FOLLOW_UP_RE.fullmatch(text):
+        return previous_agent
+    
+    medicine_hit = _MEDICINE_RE.search(text) is not None
+    travel_hit = _TRAVEL_RE.search(text) is not None
+    if medicine_hit == travel_hit:
+        return None
+    
+    target = "medicine_agent" if medicine_hit else "travel_agent"
+    if previous_agent in (None, target):
+        return target
+    return None
+
+
+def format_conversation_context(messages: list[BaseMessage], window: int = 6) -> str:
+    """Format the messages before the current one as routing context."""
+    recent_messages = messages[-window:-1]  # All except the last (current) message
+    if not recent_messages:
+        return ""
+    
+    lines = []
+    append = lines.append
+    for msg in recent_messages:
+        role = "User" if msg.type == "human" else "Assistant"
+        content = msg.content
+        append(f"{role}: {content[:200] + '...' if len(content) > 200 else content}\n")
+    return "\n\nRecent conversation context:\n" + "".join(lines)
+
 
+@functools.lru_cache(maxsize=1)
 def create_supervisor_router():
-    """Create the supervisor router that decides which agent to use."""
+    """
+    Create the supervisor router that decides which agent to use (built once, then reused).
+    
+    The router sees only the RouteDecision schema and task-level descriptions in
+    its prompt, never the agents' tool schemas; each specialist binds just its
+    own task's tools once it has been picked.
+    """
     llm = get_llm(temperature=0)  # Low temperature for consistent routing
     return llm.with_structured_output(RouteDecision)
 
 
-async def supervisor_node(state: AgentState, config: RunnableConfig) -> dict:
+def _route(state: AgentState, next_agent: str) -> Command[Literal["medicine_agent", "travel_agent", "direct_response"]]:
+    """Record the routing decision and jump straight to the node that handles it."""
+    node = AGENT_NODES[next_agent]
+    logger.debug("GRAPH ROUTING: supervisor -> %s", node)
+    return Command(
+        update={
+            "next_agent": next_agent,
+            "task_type": AGENT_TASK_TYPES[next_agent],
+            "iteration": state.get("iteration", 0) + 1,
+        },
+        goto=node,
+    )
+
+
+async def supervisor_node(
+    state: AgentState, config: RunnableConfig
+) -> Command[Literal["medicine_agent", "travel_agent", "direct_response"]]:
     """
     Supervisor node that routes to specialized agents.
     
     This uses an LLM to intelligently decide which agent should handle
-    the user's request based on the conversation context.
+    the user's request based on the conversation context, and returns a
+    Command that updates the state and routes in a single step.
     """
     messages = state.get("messages", [])
     user_message = messages[-1].content if messages else 'Hello'
     
-    logger.debug("="*60)
+    logger.debug(_LOG_RULE)
     logger.debug("SUPERVISOR NODE - Processing new request")
-    logger.debug(f"User message: {user_message[:100]}{'...' if len(str(user_message)) > 100 else ''}")
-    logger.debug(f"Message count in state: {len(messages)}")
+    logger.debug("User message: %.100s%s", user_message, "..." if len(str(user_message)) > 100 else "")
+    logger.debug("Message count in state: %s", len(messages))
+    
+    # Skip the router LLM for greetings, follow-ups and unambiguous requests
+    fast_route = _fast_route(user_message, state.get("task_type", ""))
+    if fast_route:
+        logger.debug("FAST ROUTE: %s", fast_route)
+        logger.debug(_LOG_RULE)
+        return _route(state, fast_route)
     
     # Load user preferences from memory if available
     user_id = state.get("user_id", "default_user")
     user_prefs = get_user_preferences(user_id)
     if user_prefs:
-        logger.debug(f"Loaded user preferences: {list(user_prefs.keys())}")
+        logger.debug("Loaded user preferences: %s", list(user_prefs.keys()))
     
     # Get the routing decision from the supervisor LLM
     router = create_supervisor_router()
     
     # Build conversation context from recent messages (last 6 messages for context)
-    recent_messages = messages[-6:] if len(messages) > 6 else messages
-    conversation_context = ""
-    if len(recent_messages) > 1:
-        conversation_context = "\n\nRecent conversation context:\n"
-        for msg in recent_messages[:-1]:  # All except the last (current) message
-            role = "User" if isinstance(msg, HumanMessage) else "Assistant"
-            content = msg.content[:200] + "..." if len(msg.content) > 200 else msg.content
-            conversation_context += f"{role}: {content}\n"
+    conversation_context = format_conversation_context(messages)
     
     # Build the routing prompt with context
     routing_messages = [
-        SystemMessage(content=SUPERVISOR_ROUTER_PROMPT),
+        _ROUTER_SYSTEM_MESSAGE,
         HumanMessage(content=f"Current user message: {user_message}{conversation_context}")
     ]
     
     try:
         logger.debug("Invoking router LLM for decision...")
-        decision = router.invoke(routing_messages)  # type: RouteDecision
+        decision = await router.ainvoke(routing_messages)  # type: RouteDecision
         
-        task_type = "medicine" if decision.next_agent == "medicine_agent" else \
-                    "travel" if decision.next_agent == "travel_agent" else "general"
+        logger.debug("ROUTING DECISION: %s", decision.next_agent)
+        logger.debug("Task type: %s", AGENT_TASK_TYPES[decision.next_agent])
+        logger.debug("Reasoning: %s", decision.reasoning)
+        logger.debug("Task summary: %s", decision.task_summary)
+        logger.debug(_LOG_RULE)
         
-        logger.debug(f"ROUTING DECISION: {decision.next_agent}")
-        logger.debug(f"Task type: {task_type}")
-        logger.debug(f"Reasoning: {decision.reasoning}")
-        logger.debug(f"Task summary: {decision.task_summary}")
-        logger.debug("="*60)
-        
-        return {
-            "next_agent": decision.next_agent,
-            "task_type": task_type,
-            "iteration": state.get("iteration", 0) + 1,
-        }
+        return _route(state, decision.next_agent)
     except Exception as e:
-        logger.error(f"Routing error: {e}")
+        logger.error("Routing error: %s", e)
         logger.warning("Defaulting to respond_directly")
         
-        return {
-            "next_agent": "respond_directly",
-            "task_type": "general",
-            "iteration": state.get("iteration", 0) + 1,
-        }
+        return _route(state, "respond_directly")
 
 
 # =============================================================================
 # SPECIALIZED AGENTS
 # =============================================================================
 
+@functools.lru_cache(maxsize=1)
 def create_medicine_agent():
     """
     Create the Medicine Finder Agent.
@@ -245,6 +362,8 @@ def create_medicine_agent():
     - Checking medicine availability
     - Simulating pharmacy calls
     """
+    from src.agents.medicine import get_medicine_tools, MEDICINE_SYSTEM_PROMPT
+    
     llm = get_llm(temperature=0.7)
     tools = get_medicine_tools()
     
@@ -252,9 +371,11 @@ def create_medicine_agent():
         llm,
         tools=tools,
         prompt=MEDICINE_SYSTEM_PROMPT,
+        state_schema=MedicineAgentState,
     )
 
 
+@functools.lru_cache(maxsize=1)
 def create_travel_agent():
     """
     Create the Travel Planner Agent.
@@ -264,6 +385,8 @@ def create_travel_agent():
     - Generating detailed itineraries
     - Modifying and refining travel plans
     """
+    from src.agents.travel import get_travel_tools, TRAVEL_SYSTEM_PROMPT
+    
     llm = get_llm(temperature=0.8)  # Slightly higher for creative planning
     tools = get_travel_tools()
     
@@ -274,86 +397,85 @@ def create_travel_agent():
     )
 
 
-def medicine_agent_node(state: AgentState) -> dict:
+async def medicine_agent_node(state: AgentState) -> dict:
     """Execute the medicine agent and return updated state."""
     messages = state.get("messages", [])
-    logger.debug("="*60)
+    logger.debug(_LOG_RULE)
     logger.debug("MEDICINE AGENT ACTIVATED")
-    logger.debug("Available tools: search_pharmacies, check_availability, call_pharmacy")
-    logger.debug(f"Processing {len(messages)} messages")
+    logger.debug("Available tools: search_pharmacies, check_availability, check_availability_batch, call_pharmacy")
+    logger.debug("Processing %s messages", len(messages))
     
     agent = create_medicine_agent()
     logger.debug("Invoking medicine agent...")
     
-    result = agent.invoke({"messages": messages})
+    result = await agent.ainvoke({
+        "messages": messages,
+        "agent_outputs": state.get("agent_outputs", {}),
+    })
     
     new_messages = result.get("messages", [])
-    logger.debug(f"Medicine agent completed. Generated {len(new_messages) - len(messages)} new message(s)")
-    logger.debug("="*60)
+    logger.debug("Medicine agent completed. Generated %s new message(s)", len(new_messages) - len(messages))
+    logger.debug(_LOG_RULE)
+    
+    agent_outputs = {"medicine_agent": "completed"}
+    last_search = result.get("agent_outputs", {}).get("last_pharmacy_search")
+    if last_search:
+        agent_outputs["last_pharmacy_search"] = last_search
     
     return {
         "messages": new_messages,
-        "agent_outputs": {
-            **state.get("agent_outputs", {}),
-            "medicine_agent": "completed"
-        }
+        "agent_outputs": agent_outputs,
     }
 
 
-def travel_agent_node(state: AgentState) -> dict:
+async def travel_agent_node(state: AgentState) -> dict:
     """Execute the travel agent and return updated state."""
     messages = state.get("messages", [])
-    logger.debug("="*60)
+    logger.debug(_LOG_RULE)
     logger.debug("TRAVEL AGENT ACTIVATED")
     logger.debug("Available tools: update_preferences, generate_itinerary, modify_itinerary, search_activities")
-    logger.debug(f"Processing {len(messages)} messages")
+    logger.debug("Processing %s messages", len(messages))
     
     agent = create_travel_agent()
     logger.debug("Invoking travel agent...")
     
-    result = agent.invoke({"messages": messages})
+    result = await agent.ainvoke({"messages": messages})
     
     new_messages = result.get("messages", [])
-    logger.debug(f"Travel agent completed. Generated {len(new_messages) - len(messages)} new message(s)")
-    logger.debug("="*60)
+    logger.debug("Travel agent completed. Generated %s new message(s)", len(new_messages) - len(messages))
+    logger.debug(_LOG_RULE)
     
     return {
         "messages": new_messages,
-        "agent_outputs": {
-            **state.get("agent_outputs", {}),
-            "travel_agent": "completed"
-        }
+        "agent_outputs": {"travel_agent": "completed"}
     }
 
 
-def direct_response_node(state: AgentState) -> dict:
+_DIRECT_RESPONSE_SYSTEM_MESSAGE = SystemMessage(content="""You are a helpful assistant for Pokus AI.
+You help users with medicine finding and travel planning.
+
+If the user greets you, respond warmly and explain what you can help with:
+1. Finding medicines at nearby pharmacies
+2. Planning travel itineraries
+
+Be concise and friendly.""")
+
+
+async def direct_response_node(state: AgentState) -> dict:
     """Handle simple responses directly without specialized agents."""
     messages = state.get("messages", [])
-    logger.debug("="*60)
+    logger.debug(_LOG_RULE)
     logger.debug("DIRECT RESPONSE NODE")
     logger.debug("No specialized agent needed - responding directly")
-    logger.debug(f"Processing {len(messages)} messages")
+    logger.debug("Processing %s messages", len(messages))
     
     llm = get_llm(temperature=0.7)
     
-    response = llm.invoke([
-        SystemMessage(content="""You are a helpful assistant for Pokus AI.
-You help users with medicine finding and travel planning.
-
-If the user greets you, respond warmly and explain what you can help with:
-1. Finding medicines at nearby pharmacies
-2. Planning travel itineraries
-
-Be concise and friendly."""),
-        *messages
-    ])
+    response = await llm.ainvoke([_DIRECT_RESPONSE_SYSTEM_MESSAGE, *messages])
     
     return {
         "messages": messages + [response],
-        "agent_outputs": {
-            **state.get("agent_outputs", {}),
-            "direct_response": "completed"
-        }
+        "agent_outputs": {"direct_response": "completed"}
     }
 
 
@@ -361,24 +483,22 @@ Be concise and friendly."""),
 # MULTI-AGENT GRAPH
 # =============================================================================
 
-def route_to_agent(state: AgentState) -> Literal["medicine_agent", "travel_agent", "direct_response"]:
-    """Conditional edge function to route to the appropriate agent."""
-    next_agent = state.get("next_agent", "direct_response")
-    
-    logger.debug(f"GRAPH ROUTING: supervisor -> {next_agent}")
-    
-    if next_agent == "medicine_agent":
-        return "medicine_agent"
-    elif next_agent == "travel_agent":
-        return "travel_agent"
-    else:
-        return "direct_response"
+_GRAPH_INIT_LOG = "\n".join([
+    "MULTI-AGENT SYSTEM INITIALIZED",
+    "  Supervisor Agent: Routes requests intelligently",
+    "  Medicine Agent: Handles pharmacy/medicine tasks",
+    "  Travel Agent: Handles travel planning tasks",
+])
 
 
+@functools.lru_cache(maxsize=1)
 def create_supervisor_graph():
     """
     Create the multi-agent supervisor graph.
     
+    The compiled graph is cached, so repeated calls (the FastAPI app, the
+    LangGraph dev server, tests) share one graph and checkpointer.
+    
     This is the main entry point that creates a TRUE multi-agent system:
     
     1. Supervisor receives the user message
@@ -398,9 +518,8 @@ def create_supervisor_graph():
     builder.add_node("travel_agent", travel_agent_node)
     builder.add_node("direct_response", direct_response_node)
     
-    # Define the flow
+    # Define the flow (the supervisor routes itself via Command(goto=...))
     builder.add_edge(START, "supervisor")
-    builder.add_conditional_edges("supervisor", route_to_agent)
     
     # All agents end after processing
     builder.add_edge("medicine_agent", END)
@@ -411,14 +530,47 @@ def create_supervisor_graph():
     memory = MemorySaver()
     graph = builder.compile(checkpointer=memory)
     
-    logger.debug("MULTI-AGENT SYSTEM INITIALIZED")
-    logger.debug("  Supervisor Agent: Routes requests intelligently")
-    logger.debug("  Medicine Agent: Handles pharmacy/medicine tasks")
-    logger.debug("  Travel Agent: Handles travel planning tasks")
+    logger.debug(_GRAPH_INIT_LOG)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        log_prompt_cache_eligibility()
     
     return graph
 
 
+# OpenAI only caches prompt prefixes of at least this many tokens
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+
+def log_prompt_cache_eligibility() -> None:
+    """
+    Log the token count of each static system prompt against the prompt-caching threshold.
+    
+    The system prompt is only the start of each agent's cacheable prefix (tool
+    schemas and earlier messages follow), so a short prompt is reported, not
+    padded. Called at graph creation when debug logging is enabled.
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        logger.debug("Skipping prompt token counts: %s", e)
+        return
+    
+    from src.agents.medicine import MEDICINE_SYSTEM_PROMPT
+    from src.agents.travel import TRAVEL_SYSTEM_PROMPT
+    
+    prompts = {
+        "supervisor_router": SUPERVISOR_ROUTER_PROMPT,
+        "medicine_agent": MEDICINE_SYSTEM_PROMPT,
+        "travel_agent": TRAVEL_SYSTEM_PROMPT,
+    }
+    for name, prompt in prompts.items():
+        tokens = len(encoding.encode(prompt))
+        status = "cacheable" if tokens >= PROMPT_CACHE_MIN_TOKENS else "below cache threshold"
+        logger.debug("  Prompt %s: %d tokens (%s)", name, tokens, status)
+
+
 # =============================================================================
 # LEGACY SINGLE-AGENT (kept for reference)
 # =============================================================================
@@ -428,6 +580,9 @@ def create_single_agent_graph():
     Legacy single-agent implementation.
     Kept for comparison - uses one agent with all tools.
     """
+    from src.agents.medicine import get_medicine_tools
+    from src.agents.travel import get_travel_tools
+    
     llm = get_llm()
     all_tools = get_medicine_tools() + get_travel_tools()
     
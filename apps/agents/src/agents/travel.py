@@ -8,33 +8,36 @@ This module provides tools for:
 - Searching for activities (with real web search)
 """
 
+import functools
 import logging
 import random
 import asyncio
 import os
-import json
-from datetime import datetime, timedelta
-from typing import Optional, Literal
+from datetime import date, timedelta
+from typing import Optional, Literal, TypedDict
 from langchain_core.tools import tool
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
-# CopilotKit imports for streaming state
-from copilotkit.langgraph import copilotkit_emit_state, copilotkit_customize_config
-
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def get_itinerary_llm():
-    """Get LLM instance for itinerary synthesis."""
+    """Get the shared LLM instance for itinerary synthesis."""
+    from langchain_openai import ChatOpenAI
+    
     return ChatOpenAI(
         model="gpt-4o-mini",
         temperature=0.7,
+        # Route synthesis calls to the same cache shard so the static prompt prefix is reused.
+        # Sent in the request body so openai SDKs without a prompt_cache_key argument accept it
+        extra_body={"prompt_cache_key": "travel_synth_v1"},
     )
 
 # Import web search utilities
-from src.utils.web_search import search_destination_info, search_activities_web
+from src.utils.web_search import asearch_destination_info, asearch_activities_web
 
 
 # System prompt for the travel agent
@@ -74,15 +77,109 @@ TRAVEL_SYSTEM_PROMPT = """You are an enthusiastic travel planning assistant. You
 - Make the itinerary practical and realistic for actual travel"""
 
 
-class TravelPreferences(BaseModel):
-    """User's travel preferences."""
-    destination: Optional[str] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
-    budget: Optional[Literal["budget", "moderate", "luxury"]] = None
-    interests: Optional[list[str]] = None
-    pace: Optional[Literal["relaxed", "moderate", "packed"]] = None
-    travelers: Optional[int] = None
+# Interests used when the user has not stated any
+DEFAULT_INTERESTS = ("culture", "food", "nature")
+
+# Guidance injected into the itinerary synthesis prompt
+BUDGET_GUIDANCE = {
+    "budget": "Focus on free attractions, street food, budget hostels. Daily budget: $30-50.",
+    "moderate": "Mix of paid attractions and free activities, mid-range restaurants. Daily budget: $100-150.",
+    "luxury": "Premium experiences, fine dining, luxury accommodations. Daily budget: $300+.",
+}
+
+PACE_GUIDANCE = {
+    "relaxed": "2-3 activities per day with plenty of rest time",
+    "moderate": "3-4 activities per day with breaks",
+    "packed": "5-6 activities per day, maximize the experience",
+}
+
+
+# Prompt for the internal itinerary synthesis LLM (parsed once at import).
+# Everything static - rules and the budget/pace tables - lives in the system
+# message so it forms a stable prefix for OpenAI prompt caching; the per-trip
+# human message stays small.
+ITINERARY_SYNTHESIS_SYSTEM_PROMPT = f"""You are an expert travel planner. You turn destination research into realistic, \
+well-paced day-by-day itineraries.
+
+RULES:
+- Create EXACTLY the requested number of days, one entry per listed date
+- Use REAL place names from the research provided - never invent places
+- Schedule activities in chronological order with realistic times and durations
+- Number of activities per day follows the pace table below
+- Make costs realistic for the budget level, in USD
+- If the budget or pace level is not in the tables, use moderate
+
+BUDGET LEVELS:
+{chr(10).join(f"- {level}: {text}" for level, text in BUDGET_GUIDANCE.items())}
+
+PACE LEVELS:
+{chr(10).join(f"- {level}: {text}" for level, text in PACE_GUIDANCE.items())}
+
+ACTIVITY TYPES: attraction, food, transport, accommodation, activity"""
+
+ITINERARY_SYNTHESIS_USER_TEMPLATE = """Create a {num_days}-day itinerary for {destination}.
+Budget: {budget} | Pace: {pace} | Interests: {interests}
+
+DATES:
+{dates_str}
+
+DESTINATION RESEARCH:
+{destination_info}
+
+ACTIVITY RECOMMENDATIONS BY INTEREST:
+{activities_info}"""
+
+ITINERARY_SYNTHESIS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", ITINERARY_SYNTHESIS_SYSTEM_PROMPT),
+    ("human", ITINERARY_SYNTHESIS_USER_TEMPLATE),
+])
+
+
+class TravelPreferences(TypedDict, total=False):
+    """User's travel preferences (only the keys gathered so far are present)."""
+    destination: str
+    start_date: str
+    end_date: str
+    budget: Literal["budget", "moderate", "luxury"]
+    interests: list[str]
+    pace: Literal["relaxed", "moderate", "packed"]
+    travelers: int
+
+
+class Activity(BaseModel):
+    """A single scheduled activity in an itinerary day."""
+    time: str = Field(description="Start time, e.g. '9:00 AM'")
+    title: str = Field(description="Activity name")
+    description: str = Field(description="Brief description of the activity")
+    duration: str = Field(description="How long it takes, e.g. '2 hours'")
+    type: Literal["attraction", "food", "transport", "accommodation", "activity"] = Field(
+        description="Kind of activity"
+    )
+    cost: float = Field(description="Estimated cost in USD")
+    location: str = Field(description="Real place name from the research")
+
+
+class Day(BaseModel):
+    """One day of the itinerary."""
+    day: int = Field(description="Day number, starting at 1")
+    date: str = Field(description="Date in YYYY-MM-DD format")
+    theme: str = Field(description="Day theme, e.g. 'Arrival & Exploration'")
+    activities: list[Activity] = Field(description="3-5 activities in chronological order")
+
+
+class Itinerary(BaseModel):
+    """Structured itinerary produced by the synthesis LLM."""
+    itinerary: list[Day] = Field(description="One entry per trip day")
+    total_cost: float = Field(description="Estimated total cost of all activities in USD")
+
+
+@functools.lru_cache(maxsize=1)
+def get_itinerary_chain():
+    """Get the cached prompt -> structured-output chain for itinerary synthesis."""
+    # strict=True makes OpenAI enforce the schema server-side, so responses always validate
+    return ITINERARY_SYNTHESIS_PROMPT | get_itinerary_llm().with_structured_output(
+        Itinerary, method="json_schema", strict=True
+    )
 
 
 @tool
@@ -91,7 +188,7 @@ def update_preferences(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     budget: Optional[str] = None,
-    interests: Optional[str] = None,
+    interests: Optional[list[str]] = None,
     pace: Optional[str] = None,
     travelers: Optional[int] = None,
 ) -> dict:
@@ -103,16 +200,16 @@ def update_preferences(
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
         budget: Budget level - 'budget', 'moderate', or 'luxury'
-        interests: Comma-separated list of interests (culture, food, adventure, relaxation, shopping, art, nature)
+        interests: List of interests (culture, food, adventure, relaxation, shopping, art, nature)
         pace: Trip pace - 'relaxed', 'moderate', or 'packed'
         travelers: Number of travelers
     
     Returns:
         Updated preferences summary
     """
-    logger.debug(f"[TOOL] update_preferences called")
+    logger.debug("[TOOL] update_preferences called")
     
-    updated = {}
+    updated: TravelPreferences = {}
     
     if destination:
         updated["destination"] = destination
@@ -123,13 +220,13 @@ def update_preferences(
     if budget:
         updated["budget"] = budget
     if interests:
-        updated["interests"] = [i.strip() for i in interests.split(",")]
+        updated["interests"] = interests
     if pace:
         updated["pace"] = pace
     if travelers:
         updated["travelers"] = travelers
     
-    logger.debug(f"  Updated {len(updated)} preference(s): {list(updated.keys())}")
+    logger.debug("  Updated %s preference(s): %s", len(updated), list(updated.keys()))
     
     return {
         "success": True,
@@ -139,17 +236,18 @@ def update_preferences(
 
 
 @tool
-def generate_itinerary(
+async def generate_itinerary(
     destination: str,
     start_date: str,
     end_date: str,
     budget: str = "moderate",
-    interests: str = "culture,food,nature",
+    interests: Optional[list[str]] = None,
     pace: str = "moderate",
 ) -> dict:
     """
     Research a destination and provide data for creating a travel itinerary.
     Uses Tavily web search to get real destination data with AI-synthesized recommendations.
+    The destination search and one activity search per interest run concurrently.
     
     The tool returns destination research - the LLM should use this to create
     a detailed day-by-day itinerary with specific places, times, and costs.
@@ -159,150 +257,107 @@ def generate_itinerary(
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
         budget: Budget level - 'budget', 'moderate', or 'luxury'
-        interests: Comma-separated interests
+        interests: List of interests (defaults to culture, food, nature)
         pace: Trip pace - 'relaxed', 'moderate', or 'packed'
     
     Returns:
         Destination research data for the LLM to create the itinerary
     """
-    logger.debug(f"[TOOL] generate_itinerary called")
-    logger.debug(f"  Destination: {destination}")
-    logger.debug(f"  Dates: {start_date} to {end_date}")
-    logger.debug(f"  Budget: {budget}")
-    logger.debug(f"  Interests: {interests}")
-    logger.debug(f"  Pace: {pace}")
-    
-    # Parse dates
+    logger.debug("[TOOL] generate_itinerary called")
+    logger.debug("  Destination: %s", destination)
+    logger.debug("  Dates: %s to %s", start_date, end_date)
+    logger.debug("  Budget: %s", budget)
+    logger.debug("  Interests: %s", interests)
+    logger.debug("  Pace: %s", pace)
+    
+    # Parse YYYY-MM-DD dates (date.fromisoformat is a fast C path, unlike strptime,
+    # and rejects times and UTC offsets just as "%Y-%m-%d" did)
     try:
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
     except ValueError:
-        start = datetime.now()
+        start = date.today()
         end = start + timedelta(days=5)
     
     num_days = (end - start).days
     num_days = min(num_days, 14)  # Cap at 14 days
     
-    logger.debug(f"  Trip duration: {num_days} days")
+    logger.debug("  Trip duration: %s days", num_days)
     
-    # Parse interests
-    interest_list = [i.strip().lower() for i in interests.split(",")]
+    # Normalize interests
+    interest_list = [i.strip().lower() for i in interests or DEFAULT_INTERESTS]
     
-    # Get real destination info from web search (now with AI-synthesized answer)
-    logger.debug(f"  Fetching destination info from Tavily...")
-    web_data = search_destination_info(destination, interest_list)
+    # Fetch destination info and per-interest activities from Tavily concurrently
+    # (results are cached, so refining dates or budget reuses them)
+    logger.debug("  Fetching destination info and %s activity search(es) from Tavily...", len(interest_list))
+    web_data, *activity_results = await asyncio.gather(
+        asearch_destination_info(destination, interest_list),
+        *(asearch_activities_web(destination, interest, budget) for interest in interest_list),
+    )
     
     if not web_data.get("success"):
         error_msg = web_data.get("error", "Unknown error occurred")
-        logger.error(f"Tavily search failed for {destination}: {error_msg}")
+        logger.error("Tavily search failed for %s: %s", destination, error_msg)
         return {
             "error": True,
             "message": f"Could not fetch destination info for {destination}: {error_msg}",
             "suggestion": "Please ensure the Tavily API key is configured correctly, or try again later.",
         }
     
-    logger.debug(f"  SUCCESS: Fetched destination data from Tavily")
+    logger.debug("  SUCCESS: Fetched destination data from Tavily")
     
     # Get the AI-synthesized answer with real place names
     destination_info = web_data.get("answer", "")
-    sources = web_data.get("sources", [])
-    
-    logger.debug(f"  Got destination info: {len(destination_info)} chars")
-    
-    # Budget guidance for the LLM
-    budget_guidance = {
-        "budget": "Focus on free attractions, street food, budget hostels. Daily budget: $30-50.",
-        "moderate": "Mix of paid attractions and free activities, mid-range restaurants. Daily budget: $100-150.",
-        "luxury": "Premium experiences, fine dining, luxury accommodations. Daily budget: $300+.",
-    }
-    
-    # Pace guidance
-    pace_guidance = {
-        "relaxed": "2-3 activities per day with plenty of rest time",
-        "moderate": "3-4 activities per day with breaks",
-        "packed": "5-6 activities per day, maximize the experience",
-    }
     
-    # Build date list for itinerary
-    dates = []
-    for day_num in range(num_days):
-        current_date = start + timedelta(days=day_num)
-        dates.append({
-            "day": day_num + 1,
-            "date": current_date.strftime("%Y-%m-%d"),
-            "weekday": current_date.strftime("%A"),
-        })
+    logger.debug("  Got destination info: %s chars", len(destination_info))
     
-    # Format source snippets for LLM (contains pricing info)
-    source_content = "\n".join([s.get("snippet", "") for s in sources if s.get("snippet")])
+    # Activity recommendations are extra context; a failed search is simply left out
+    activities_info = "\n\n".join(
+        f"{interest.upper()}:\n{result['answer']}"
+        for interest, result in zip(interest_list, activity_results)
+        if result.get("success") and result.get("answer")
+    )
+    logger.debug("  Got activity info: %s chars", len(activities_info))
     
     # Use internal LLM to synthesize structured itinerary from research
     logger.debug("  Synthesizing structured itinerary with LLM...")
     
-    llm = get_itinerary_llm()
+    chain = get_itinerary_chain()
     
-    # Build dates string for the prompt
-    dates_str = "\n".join([f"Day {d['day']}: {d['date']} ({d['weekday']})" for d in dates])
-    
-    synthesis_prompt = f"""Based on this research about {destination}, create a detailed {num_days}-day travel itinerary.
-
-DESTINATION RESEARCH:
-{destination_info}
-
-TRIP DETAILS:
-- Dates:
-{dates_str}
-- Budget: {budget} - {budget_guidance.get(budget, budget_guidance['moderate'])}
-- Pace: {pace} - {pace_guidance.get(pace, pace_guidance['moderate'])}
-- Interests: {', '.join(interest_list)}
-
-CREATE EXACTLY {num_days} DAYS with 3-5 activities each. Use REAL place names from the research above.
-
-Return ONLY valid JSON (no markdown, no explanation) in this exact format:
-{{
-  "itinerary": [
-    {{
-      "day": 1,
-      "date": "YYYY-MM-DD",
-      "theme": "Day Theme (e.g., Arrival & Exploration)",
-      "activities": [
-        {{
-          "time": "9:00 AM",
-          "title": "Activity Name",
-          "description": "Brief description of activity",
-          "duration": "2 hours",
-          "type": "attraction",
-          "cost": 25,
-          "location": "Location Name"
-        }}
-      ]
-    }}
-  ],
-  "total_cost": 500
-}}
-
-Activity types: attraction, food, transport, accommodation, activity
-Make costs realistic for the {budget} budget level."""
+    # Build dates string for the prompt in a single pass
+    dates_str = "\n".join(
+        f"Day {i + 1}: {(start + timedelta(days=i)).strftime('%Y-%m-%d (%A)')}"
+        for i in range(num_days)
+    )
     
     try:
-        response = llm.invoke(synthesis_prompt)
-        response_text = response.content.strip()
-        
-        # Clean up response - remove markdown code blocks if present
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-            response_text = response_text.strip()
-        
-        itinerary_data = json.loads(response_text)
+        # Structured output guarantees a parseable itinerary, no JSON cleanup needed
+        result = await chain.ainvoke({
+            "destination": destination,
+            "num_days": num_days,
+            "destination_info": destination_info,
+            "activities_info": activities_info or "None found",
+            "dates_str": dates_str,
+            "budget": budget,
+            "pace": pace,
+            "interests": ", ".join(interest_list),
+        })
         
-        # Add IDs to activities for frontend
-        for day in itinerary_data.get("itinerary", []):
-            for idx, act in enumerate(day.get("activities", [])):
-                act["id"] = f"day{day['day']}-act{idx + 1}"
+        # Build the outgoing itinerary in one pass, adding activity IDs for the frontend
+        itinerary = [
+            {
+                "day": day.day,
+                "date": day.date,
+                "theme": day.theme,
+                "activities": [
+                    {**act.model_dump(), "id": f"day{day.day}-act{idx}"}
+                    for idx, act in enumerate(day.activities, 1)
+                ],
+            }
+            for day in result.itinerary
+        ]
         
-        logger.debug(f"  SUCCESS: Generated {len(itinerary_data.get('itinerary', []))}-day structured itinerary")
+        logger.debug("  SUCCESS: Generated %s-day structured itinerary", len(itinerary))
         
         return {
             "success": True,
@@ -313,8 +368,8 @@ Make costs realistic for the {budget} budget level."""
             "budget_level": budget,
             "pace": pace,
             "interests": interest_list,
-            "itinerary": itinerary_data.get("itinerary", []),
-            "total_cost": itinerary_data.get("total_cost", 0),
+            "itinerary": itinerary,
+            "total_cost": result.total_cost,
             "tips": [
                 "Book popular attractions in advance",
                 "Consider travel insurance for your trip",
@@ -324,17 +379,8 @@ Make costs realistic for the {budget} budget level."""
             "message": f"Created a {num_days}-day itinerary for {destination}! Check the left panel for details.",
         }
         
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse itinerary JSON: {e}")
-        logger.error(f"Response was: {response_text[:500]}...")
-        return {
-            "error": True,
-            "message": f"Failed to generate structured itinerary. Please try again.",
-            "destination": destination,
-            "num_days": num_days,
-        }
     except Exception as e:
-        logger.error(f"Error synthesizing itinerary: {e}")
+        logger.error("Error synthesizing itinerary: %s", e)
         return {
             "error": True,
             "message": f"Error creating itinerary: {str(e)}",
@@ -343,10 +389,40 @@ Make costs realistic for the {budget} budget level."""
         }
 
 
+def _remove_activity(day: int, activity_index: Optional[int], new_activity: dict) -> dict:
+    return {
+        "activity_index": activity_index,
+        "message": f"Removed activity {activity_index} from day {day}",
+    }
+
+
+def _add_activity(day: int, activity_index: Optional[int], new_activity: dict) -> dict:
+    return {
+        "new_activity": new_activity,
+        "message": f"Added '{new_activity['title']}' to day {day} at {new_activity['time']}",
+    }
+
+
+def _replace_activity(day: int, activity_index: Optional[int], new_activity: dict) -> dict:
+    return {
+        "activity_index": activity_index,
+        "new_activity": new_activity,
+        "message": f"Replaced activity {activity_index} on day {day} with '{new_activity['title']}'",
+    }
+
+
+# Action-specific fields for modify_itinerary results
+_MODIFY_HANDLERS = {
+    "remove": _remove_activity,
+    "add": _add_activity,
+    "replace": _replace_activity,
+}
+
+
 @tool
 def modify_itinerary(
     day: int,
-    action: str,
+    action: Literal["remove", "add", "replace"],
     activity_index: Optional[int] = None,
     new_activity_title: Optional[str] = None,
     new_activity_description: Optional[str] = None,
@@ -366,52 +442,27 @@ def modify_itinerary(
     Returns:
         Confirmation of the modification
     """
-    logger.debug(f"[TOOL] modify_itinerary called")
-    logger.debug(f"  Day: {day}, Action: {action}")
+    logger.debug("[TOOL] modify_itinerary called")
+    logger.debug("  Day: %s, Action: %s", day, action)
     if activity_index is not None:
-        logger.debug(f"  Activity index: {activity_index}")
+        logger.debug("  Activity index: %s", activity_index)
     if new_activity_title:
-        logger.debug(f"  New activity: {new_activity_title}")
+        logger.debug("  New activity: %s", new_activity_title)
     
-    if action == "remove":
-        return {
-            "success": True,
-            "action": "remove",
-            "day": day,
-            "activity_index": activity_index,
-            "message": f"Removed activity {activity_index} from day {day}",
-        }
-    elif action == "add":
-        return {
-            "success": True,
-            "action": "add",
-            "day": day,
-            "new_activity": {
-                "title": new_activity_title,
-                "description": new_activity_description,
-                "time": new_activity_time,
-            },
-            "message": f"Added '{new_activity_title}' to day {day} at {new_activity_time}",
-        }
-    elif action == "replace":
-        return {
-            "success": True,
-            "action": "replace",
-            "day": day,
-            "activity_index": activity_index,
-            "new_activity": {
-                "title": new_activity_title,
-                "description": new_activity_description,
-                "time": new_activity_time,
-            },
-            "message": f"Replaced activity {activity_index} on day {day} with '{new_activity_title}'",
-        }
+    handler = _MODIFY_HANDLERS.get(action)
+    if handler is None:
+        return {"success": False, "message": f"Unknown action: {action}"}
     
-    return {"success": False, "message": f"Unknown action: {action}"}
+    new_activity = {
+        "title": new_activity_title,
+        "description": new_activity_description,
+        "time": new_activity_time,
+    }
+    return {"success": True, "action": action, "day": day, **handler(day, activity_index, new_activity)}
 
 
 @tool
-def search_activities(
+async def search_activities(
     destination: str,
     activity_type: str,
     budget: str = "moderate",
@@ -428,19 +479,19 @@ def search_activities(
     Returns:
         AI-synthesized recommendations with real place names
     """
-    logger.debug(f"[TOOL] search_activities called")
-    logger.debug(f"  Destination: {destination}")
-    logger.debug(f"  Activity type: {activity_type}")
-    logger.debug(f"  Budget: {budget}")
+    logger.debug("[TOOL] search_activities called")
+    logger.debug("  Destination: %s", destination)
+    logger.debug("  Activity type: %s", activity_type)
+    logger.debug("  Budget: %s", budget)
     
     # Use web search with AI synthesis
-    logger.debug(f"  Searching Tavily for activities...")
-    web_results = search_activities_web(destination, activity_type, budget)
+    logger.debug("  Searching Tavily for activities...")
+    web_results = await asearch_activities_web(destination, activity_type, budget)
     
     if web_results.get("success") and web_results.get("answer"):
         answer = web_results["answer"]
         sources = web_results.get("sources", [])
-        logger.debug(f"  SUCCESS: Got AI-synthesized answer ({len(answer)} chars)")
+        logger.debug("  SUCCESS: Got AI-synthesized answer (%s chars)", len(answer))
         return {
             "success": True,
             "destination": destination,
@@ -453,7 +504,7 @@ def search_activities(
     
     # Return error if web search fails
     error_msg = web_results.get("error", "Unknown error occurred")
-    logger.error(f"  FAILED: Tavily search error - {error_msg}")
+    logger.error("  FAILED: Tavily search error - %s", error_msg)
     
     return {
         "error": True,
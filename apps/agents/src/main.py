@@ -6,11 +6,17 @@ the Pokus AI task completion system. It uses LangGraph for agent orchestration
 and CopilotKit for frontend integration.
 """
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
 from copilotkit import LangGraphAGUIAgent
 from ag_ui_langgraph import add_langgraph_fastapi_endpoint
 
@@ -37,23 +43,71 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Initialize task registry with default tasks
-initialize_default_tasks()
+# Reset when the app starts serving (used for health checks)
+startup_time = datetime.now()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run per-worker startup work once the server starts, not at import."""
+    global startup_time
+    logger.info("🚀 Pokus AI Agents starting...")
+    
+    # Sync tools, sync Tavily searches and LangChain callbacks run in the loop's
+    # default executor; size it explicitly so they don't queue behind each other
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+        max_workers=int(os.getenv("THREAD_POOL_WORKERS", "16")),
+        thread_name_prefix="agents",
+    ))
+    
+    # Initialize task registry with default tasks
+    initialize_default_tasks()
+    
+    # Surface a missing Tavily key at startup instead of on the first search
+    from src.utils.web_search import tavily_configured
+    tavily_configured()
+    
+    # Build the router before the first request; a missing OpenAI key is logged
+    # here rather than failing startup (the first routed request will raise it)
+    from src.agents.supervisor import create_supervisor_router
+    try:
+        create_supervisor_router()
+    except Exception as e:
+        logger.error("Could not build the supervisor router: %s", e)
+    
+    startup_time = datetime.now()
+    yield
+    
+    # Release pooled Tavily connections on shutdown
+    from src.utils.web_search import close_tavily_client
+    await close_tavily_client()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Pokus AI Agents",
     description="Multi-agent system for real-world task completion",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Log startup
-logger.info("🚀 Pokus AI Agents starting...")
+class JSONGZipMiddleware(GZipMiddleware):
+    """Gzip regular responses but leave AG-UI event streams uncompressed so events flush immediately."""
 
-# Store startup time for health checks
-startup_time = datetime.now()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            accept = dict(scope["headers"]).get(b"accept", b"")
+            if b"text/event-stream" in accept:
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+# Compress large JSON payloads (itineraries, task manifest, test-graph results)
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024)
 
-# Configure CORS
+# Configure CORS (explicit lists let Starlette answer preflights without echoing request headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -62,8 +116,8 @@ app.add_middleware(
         "http://127.0.0.1:3000",
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "authorization", "x-copilotkit-session"],
 )
 
 
@@ -141,4 +195,16 @@ async def test_graph(message: str = "Find me ibuprofen near San Francisco"):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="warning")
+    # Conversation state lives in an in-process MemorySaver, so keep a single
+    # worker unless WEB_CONCURRENCY is raised deliberately
+    uvicorn.run(
+        "src.main:app",
+        host="0.0.0.0",
+        port=8000,
+        log_level="warning",
+        # "auto" picks uvloop/httptools when installed (uvloop isn't on Windows)
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        access_log=False,
+    )
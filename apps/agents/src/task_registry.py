@@ -16,17 +16,29 @@ To add a new task:
 This pattern allows the system to scale to unlimited task types.
 """
 
+import importlib
 import logging
+import operator
+import re
 from dataclasses import dataclass, field
-from typing import Callable, Any
+from types import MappingProxyType
+from typing import Callable, Any, Mapping
 from langchain_core.tools import BaseTool
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Shared read-only default for tasks registered without metadata
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
 class TaskDefinition:
-    """Definition of a task type in the system."""
+    """
+    Definition of a task type in the system.
+    
+    Immutable once created; use dataclasses.replace() to derive a changed copy.
+    """
     id: str                                    # Unique identifier (e.g., "medicine")
     name: str                                  # Display name (e.g., "Find Medicine")
     description: str                           # What this task does
@@ -34,10 +46,45 @@ class TaskDefinition:
     color: str                                 # Theme color (e.g., "emerald", "blue")
     keywords: list[str]                        # Keywords for routing
     get_tools: Callable[[], list[BaseTool]]   # Function that returns the task's tools
-    system_prompt: str                         # Specialized system prompt
+    get_system_prompt: Callable[[], str]       # Function that returns the specialized system prompt
     category: str = "general"                  # Category grouping
     enabled: bool = True                       # Whether task is active
-    metadata: dict = field(default_factory=dict)  # Additional metadata
+    # Additional metadata; defaults to one shared read-only mapping (pass a dict to own it)
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_METADATA)
+    
+    @property
+    def system_prompt(self) -> str:
+        """Specialized system prompt (loads the task's module on first access)."""
+        return self.get_system_prompt()
+
+
+def lazy_attr(module_name: str, attr: str) -> Callable[[], Any]:
+    """
+    Return a loader that imports `module_name` on first call and returns `attr`.
+    
+    Lets tasks be registered without importing their agent modules; the import
+    happens when the task's tools or prompt are first needed.
+    """
+    def load() -> Any:
+        return getattr(importlib.import_module(module_name), attr)
+    return load
+
+
+def lazy_tools(module_name: str, factory: str) -> Callable[[], list[BaseTool]]:
+    """Return a get_tools callable that imports `module_name` and calls `factory`."""
+    load_factory = lazy_attr(module_name, factory)
+    return lambda: load_factory()()
+
+
+# Fields exposed to the supervisor and to the frontend, read in one C-level call per task
+_ROUTING_FIELDS = ("name", "description", "keywords")
+_MANIFEST_FIELDS = ("id", "name", "description", "icon", "color", "category", "enabled")
+_get_routing_fields = operator.attrgetter(*_ROUTING_FIELDS)
+_get_manifest_fields = operator.attrgetter(*_MANIFEST_FIELDS)
+
+# Texts up to this length are routed by word-set intersection before falling back to the regex
+_SHORT_TEXT_CHARS = 512
+_WORD_RE = re.compile(r"\w+")
 
 
 class TaskRegistry:
@@ -49,11 +96,33 @@ class TaskRegistry:
     - Task lookup by ID or keywords
     - Tool aggregation for supervisor agent
     - Metadata for frontend rendering
+    
+    Aggregated views are cached and rebuilt after the next register(), so they are
+    returned read-only (tuples and mapping proxies); to change a task, register a
+    copy, e.g. `register(replace(task, enabled=False))`.
     """
     
     def __init__(self):
         self._tasks: dict[str, TaskDefinition] = {}
         self._keyword_index: dict[str, str] = {}  # keyword -> task_id
+        # First words of keywords that span several words (e.g. "rite" for "rite aid")
+        self._phrase_heads: set[str] = set()
+        self._keyword_pattern: re.Pattern | None = None  # built lazily from the index
+        # Derived views, computed on first use and dropped on register()
+        self._enabled_cache: tuple[TaskDefinition, ...] | None = None
+        self._tools_cache: tuple[BaseTool, ...] | None = None
+        self._tools_by_task: dict[str, tuple[BaseTool, ...]] = {}
+        self._routing_cache: Mapping[str, Mapping[str, Any]] | None = None
+        self._manifest_cache: tuple[Mapping[str, Any], ...] | None = None
+    
+    def _invalidate_caches(self) -> None:
+        """Drop all derived views (call after tasks change)."""
+        self._keyword_pattern = None
+        self._enabled_cache = None
+        self._tools_cache = None
+        self._tools_by_task.clear()
+        self._routing_cache = None
+        self._manifest_cache = None
     
     def register(self, task: TaskDefinition) -> None:
         """Register a new task type."""
@@ -61,9 +130,13 @@ class TaskRegistry:
         
         # Build keyword index for routing
         for keyword in task.keywords:
-            self._keyword_index[keyword.lower()] = task.id
+            keyword = keyword.lower()
+            self._keyword_index[keyword] = task.id
+            if not _WORD_RE.fullmatch(keyword):
+                self._phrase_heads.update(_WORD_RE.findall(keyword)[:1])
+        self._invalidate_caches()
         
-        logger.debug(f"Registered task: {task.name} ({task.id}) with {len(task.keywords)} keywords")
+        logger.debug("Registered task: %s (%s) with %d keywords", task.name, task.id, len(task.keywords))
     
     def get_task(self, task_id: str) -> TaskDefinition | None:
         """Get a task by its ID."""
@@ -73,57 +146,93 @@ class TaskRegistry:
         """Get all registered tasks."""
         return list(self._tasks.values())
     
-    def get_enabled_tasks(self) -> list[TaskDefinition]:
+    def get_enabled_tasks(self) -> tuple[TaskDefinition, ...]:
         """Get only enabled tasks."""
-        return [t for t in self._tasks.values() if t.enabled]
+        if self._enabled_cache is None:
+            self._enabled_cache = tuple(t for t in self._tasks.values() if t.enabled)
+        return self._enabled_cache
+    
+    def _get_keyword_pattern(self) -> re.Pattern:
+        """
+        Compile all keywords into one whole-word alternation, longest first, so a
+        single scan of the text finds the earliest and most specific keyword.
+        Matching is case-insensitive, so long texts are scanned without a
+        lowercased copy.
+        """
+        if self._keyword_pattern is None:
+            keywords = sorted(self._keyword_index, key=len, reverse=True)
+            self._keyword_pattern = re.compile(
+                r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b", re.IGNORECASE
+            )
+        return self._keyword_pattern
     
     def find_task_by_keyword(self, text: str) -> TaskDefinition | None:
-        """Find a task based on keywords in the text."""
-        text_lower = text.lower()
-        for keyword, task_id in self._keyword_index.items():
-            if keyword in text_lower:
-                return self._tasks.get(task_id)
+        """
+        Find a task based on keywords in the text.
+        
+        Keywords match whole words only, so list plural forms explicitly. The task
+        of the earliest keyword in the text wins. Short texts (most routing inputs)
+        are split into words and looked up in the keyword index, which gives the
+        same answer as the compiled pattern; long texts, and texts containing the
+        first word of a multi-word keyword, are scanned with the pattern.
+        """
+        if not self._keyword_index:
+            return None
+        if len(text) <= _SHORT_TEXT_CHARS:
+            words = _WORD_RE.findall(text.lower())
+            if self._phrase_heads.isdisjoint(words):
+                index = self._keyword_index
+                for word in words:
+                    if (task_id := index.get(word)) is not None:
+                        return self._tasks[task_id]
+                return None
+        match = self._get_keyword_pattern().search(text)
+        if match:
+            return self._tasks.get(self._keyword_index[match.group().lower()])
         return None
     
-    def get_all_tools(self) -> list[BaseTool]:
-        """Get all tools from all enabled tasks."""
-        tools = []
-        for task in self.get_enabled_tasks():
-            tools.extend(task.get_tools())
-        return tools
+    def get_all_tools(self) -> tuple[BaseTool, ...]:
+        """
+        Get all tools from all enabled tasks.
+        
+        Only for single-agent setups; the supervisor routes on task-level info and
+        each specialist agent loads its own tools via get_task_tools().
+        """
+        if self._tools_cache is None:
+            self._tools_cache = tuple(
+                tool
+                for task in self.get_enabled_tasks()
+                for tool in self.get_task_tools(task.id)
+            )
+        return self._tools_cache
     
-    def get_task_tools(self, task_id: str) -> list[BaseTool]:
-        """Get tools for a specific task."""
-        task = self.get_task(task_id)
-        if task:
-            return task.get_tools()
-        return []
+    def get_task_tools(self, task_id: str) -> tuple[BaseTool, ...]:
+        """Get tools for a specific task (each task's get_tools() runs once)."""
+        tools = self._tools_by_task.get(task_id)
+        if tools is None:
+            task = self.get_task(task_id)
+            if not task:
+                return ()
+            tools = self._tools_by_task[task_id] = tuple(task.get_tools())
+        return tools
     
-    def get_routing_info(self) -> dict:
+    def get_routing_info(self) -> Mapping[str, Mapping[str, Any]]:
         """Get information for the supervisor's routing decisions."""
-        return {
-            task.id: {
-                "name": task.name,
-                "description": task.description,
-                "keywords": task.keywords,
-            }
-            for task in self.get_enabled_tasks()
-        }
+        if self._routing_cache is None:
+            self._routing_cache = MappingProxyType({
+                task.id: MappingProxyType(dict(zip(_ROUTING_FIELDS, _get_routing_fields(task))))
+                for task in self.get_enabled_tasks()
+            })
+        return self._routing_cache
     
-    def to_frontend_manifest(self) -> list[dict]:
+    def to_frontend_manifest(self) -> tuple[Mapping[str, Any], ...]:
         """Generate manifest for frontend task selection."""
-        return [
-            {
-                "id": task.id,
-                "name": task.name,
-                "description": task.description,
-                "icon": task.icon,
-                "color": task.color,
-                "category": task.category,
-                "enabled": task.enabled,
-            }
-            for task in self._tasks.values()
-        ]
+        if self._manifest_cache is None:
+            self._manifest_cache = tuple(
+                MappingProxyType(dict(zip(_MANIFEST_FIELDS, _get_manifest_fields(task))))
+                for task in self._tasks.values()
+            )
+        return self._manifest_cache
 
 
 # Global registry instance
@@ -141,10 +250,11 @@ def register_task(task: TaskDefinition) -> None:
 
 
 def initialize_default_tasks() -> None:
-    """Initialize the registry with default tasks."""
-    from src.agents.medicine import get_medicine_tools, MEDICINE_SYSTEM_PROMPT
-    from src.agents.travel import get_travel_tools, TRAVEL_SYSTEM_PROMPT
+    """
+    Initialize the registry with default tasks.
     
+    Agent modules are not imported here; their tools and prompts load on first use.
+    """
     # Register Medicine Finder task
     register_task(TaskDefinition(
         id="medicine",
@@ -153,12 +263,13 @@ def initialize_default_tasks() -> None:
         icon="pill",
         color="emerald",
         keywords=[
-            "medicine", "pharmacy", "drug", "medication", "prescription",
-            "paracetamol", "ibuprofen", "aspirin", "antibiotic", "pill",
-            "drugstore", "cvs", "walgreens", "rite aid"
+            "medicine", "medicines", "pharmacy", "pharmacies", "drug", "drugs",
+            "medication", "medications", "prescription", "prescriptions",
+            "paracetamol", "ibuprofen", "aspirin", "antibiotic", "antibiotics",
+            "pill", "pills", "drugstore", "cvs", "walgreens", "rite aid"
         ],
-        get_tools=get_medicine_tools,
-        system_prompt=MEDICINE_SYSTEM_PROMPT,
+        get_tools=lazy_tools("src.agents.medicine", "get_medicine_tools"),
+        get_system_prompt=lazy_attr("src.agents.medicine", "MEDICINE_SYSTEM_PROMPT"),
         category="health",
         metadata={
             "simulated_features": ["pharmacy_call"],
@@ -174,12 +285,13 @@ def initialize_default_tasks() -> None:
         icon="plane",
         color="blue",
         keywords=[
-            "travel", "trip", "vacation", "holiday", "itinerary",
-            "flight", "hotel", "destination", "bali", "tokyo", "paris",
-            "adventure", "beach", "mountain", "city break"
+            "travel", "traveling", "travelling", "trip", "trips", "vacation",
+            "vacations", "holiday", "holidays", "itinerary", "flight", "flights",
+            "hotel", "hotels", "destination", "bali", "tokyo", "paris",
+            "adventure", "beach", "beaches", "mountain", "mountains", "city break"
         ],
-        get_tools=get_travel_tools,
-        system_prompt=TRAVEL_SYSTEM_PROMPT,
+        get_tools=lazy_tools("src.agents.travel", "get_travel_tools"),
+        get_system_prompt=lazy_attr("src.agents.travel", "TRAVEL_SYSTEM_PROMPT"),
         category="lifestyle",
         metadata={
             "simulated_features": ["booking"],
@@ -187,7 +299,7 @@ def initialize_default_tasks() -> None:
         }
     ))
     
-    logger.debug(f"Initialized {len(_registry.get_all_tasks())} tasks in registry")
+    logger.debug("Initialized %d tasks in registry", len(_registry.get_all_tasks()))
 
 
 # Example: How to add a new task (e.g., Plumber Booking)
@@ -214,10 +326,8 @@ To add a new "Book Plumber" task:
        return [search_plumbers, book_appointment]
    ```
 
-2. Register in this file:
+2. Register in this file (the agent module is imported lazily on first use):
    ```python
-   from src.agents.plumber import get_plumber_tools, PLUMBER_SYSTEM_PROMPT
-   
    register_task(TaskDefinition(
        id="plumber",
        name="Book Plumber",
@@ -225,8 +335,8 @@ To add a new "Book Plumber" task:
        icon="wrench",
        color="orange",
        keywords=["plumber", "plumbing", "leak", "pipe", "drain", "faucet"],
-       get_tools=get_plumber_tools,
-       system_prompt=PLUMBER_SYSTEM_PROMPT,
+       get_tools=lazy_tools("src.agents.plumber", "get_plumber_tools"),
+       get_system_prompt=lazy_attr("src.agents.plumber", "PLUMBER_SYSTEM_PROMPT"),
        category="home_services",
    ))
    ```
@@ -9,6 +9,14 @@ Key Functions:
 - search_pharmacies_web: Find pharmacies near a location with medicine availability
 - search_destination_info: Get travel destination info with attractions and costs
 - search_activities_web: Find specific activities at a destination
+- search_medicine_availability: Check a pharmacy for a specific medicine
+- asearch_*: Async variants that call Tavily's REST API over a shared aiohttp
+  session, so agents can run several searches concurrently
+
+Every search keeps successful results in an in-process TTL cache keyed by its
+normalized arguments; sync and async variants share it. Async variants also
+coalesce concurrent identical misses and share a semaphore (TAVILY_CONCURRENCY,
+default 8) that bounds concurrent Tavily requests.
 
 Configuration:
 - Set TAVILY_API_KEY in .env file
@@ -19,76 +27,168 @@ Falls back to simulated results if API key is not available.
 
 import os
 import json
+import asyncio
+import functools
+import hashlib
+import inspect
 import logging
-from typing import Optional
-from tavily import TavilyClient
+import re
+import threading
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+import aiohttp
+from cachetools import TTLCache
+
+if TYPE_CHECKING:
+    from tavily import TavilyClient
 
 logger = logging.getLogger(__name__)
 
+# Per-function result caches (see cached_search), tracked so they can be cleared together
+_search_caches: list[TTLCache] = []
+# One lock per in-flight key so concurrent identical misses share a single fetch
+_search_locks: dict[str, asyncio.Lock] = {}
+# Caps concurrent Tavily requests from async callers to stay under the plan's rate limit
+TAVILY_CONCURRENCY = int(os.getenv("TAVILY_CONCURRENCY", "8"))
+_TAVILY_SEM = asyncio.Semaphore(TAVILY_CONCURRENCY)
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+TAVILY_TIMEOUT_SECONDS = 60
+# Shared session for async searches (see get_http_session)
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+@functools.lru_cache(maxsize=1)
+def _create_tavily_client(api_key: str) -> "TavilyClient":
+    """Create the Tavily client shared by all searches using this API key."""
+    # Imported here so processes without a key (or only using the async REST path)
+    # never load tavily and its requests stack
+    from tavily import TavilyClient
+    
+    logger.debug("Tavily client initialized")
+    return TavilyClient(api_key=api_key)
+
 
-def get_tavily_client() -> Optional[TavilyClient]:
-    """Get Tavily client if API key is available."""
+def _get_tavily_api_key() -> Optional[str]:
+    """Get the configured Tavily API key, ignoring the .env placeholder."""
     api_key = os.getenv("TAVILY_API_KEY")
     if api_key and api_key != "your_tavily_api_key":
-        logger.debug("Tavily client initialized")
-        return TavilyClient(api_key=api_key)
+        return api_key
     logger.warning("Tavily API key not configured")
     return None
 
 
-def search_pharmacies_web(
-    medicine_name: str,
-    location: str,
-    radius_km: float = 5.0,
-) -> dict:
-    """
-    Search for real pharmacies using web search.
-    Uses include_answer=True to get AI-synthesized content with real pharmacy info.
-    Returns the answer and sources for internal LLM to structure.
+def tavily_configured() -> bool:
+    """Check whether a Tavily API key is set (warns if not) without creating a client."""
+    return _get_tavily_api_key() is not None
+
+
+def get_tavily_client() -> Optional["TavilyClient"]:
+    """Get the shared Tavily client if API key is available."""
+    api_key = _get_tavily_api_key()
+    return _create_tavily_client(api_key) if api_key else None
+
+
+def _normalize_arg(value) -> str:
+    """Normalize a search argument for cache keys (case, whitespace, list order)."""
+    if isinstance(value, (list, tuple)):
+        return ",".join(sorted(_normalize_arg(v) for v in value))
+    return " ".join(str(value).lower().split())
+
+
+def cached_search(ttl_seconds: int = 3600, maxsize: int = 1024):
     """
-    logger.debug(f"[TAVILY] Pharmacy search: {medicine_name} near {location}")
-    client = get_tavily_client()
-    
-    if not client:
-        logger.error("[TAVILY] No client available")
-        return {"success": False, "error": "Tavily API key not configured", "use_fallback": True}
+    Cache successful results of a search function in a TTL cache.
     
-    try:
-        # Search for pharmacies with medicine - include pricing and contact info
-        query = f"pharmacies near {location} that have {medicine_name} in stock. Include pharmacy names, addresses, phone numbers, hours of operation, and prices."
-        logger.debug(f"[TAVILY] Query: {query}")
+    The key is a digest of the function name and its normalized arguments, so
+    "Paracetamol near  10001" and "paracetamol near 10001" share an entry.
+    Failed or fallback results are never cached.
+    """
+    def decorator(search: Callable[..., dict]) -> Callable[..., dict]:
+        cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        lock = threading.Lock()  # searches also run in worker threads
+        signature = inspect.signature(search)
+        _search_caches.append(cache)
         
-        results = client.search(
-            query=query,
-            search_depth="advanced",
-            max_results=10,
-            include_answer=True,
-        )
+        def cache_key(*args, **kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            raw = "|".join([search.__name__, *map(_normalize_arg, bound.arguments.values())])
+            return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+        
+        def cache_lookup(key: str) -> Optional[dict]:
+            with lock:
+                return cache.get(key)
         
+        @functools.wraps(search)
+        def wrapper(*args, **kwargs) -> dict:
+            key = cache_key(*args, **kwargs)
+            if (cached := cache_lookup(key)) is not None:
+                logger.debug("[TAVILY] Cache hit: %s", search.__name__)
+                return cached
+            result = search(*args, **kwargs)
+            if result.get("success"):
+                cache_store(key, result)
+            return result
+        
+        def cache_store(key: str, result: dict) -> None:
+            with lock:
+                cache[key] = result
+        
+        wrapper.cache_key = cache_key
+        wrapper.cache_lookup = cache_lookup
+        wrapper.cache_store = cache_store
+        return wrapper
+    return decorator
+
+
+# Each search is split into a request builder (Tavily parameters plus a function
+# that shapes the raw response) so the sync TavilyClient path and the async
+# aiohttp path share the same queries and result format.
+SearchPlan = tuple[dict, Callable[[dict], dict]]
+
+# Per-result content caps: sources carry a short snippet, fallback answers a longer one
+_SOURCE_SNIPPET_CHARS = 400
+_CONTEXT_SNIPPET_CHARS = 500
+_AVAILABILITY_CONTENT_CHARS = 500
+
+
+def _pharmacy_search(medicine_name: str, location: str, max_results: int) -> SearchPlan:
+    # Search for pharmacies with medicine - include pricing and contact info
+    query = f"pharmacies near {location} that have {medicine_name} in stock. Include pharmacy names, addresses, phone numbers, hours of operation, and prices."
+    params = {
+        "query": query,
+        "search_depth": "advanced",
+        "max_results": max_results,
+        "include_answer": True,
+    }
+    
+    def shape(results: dict) -> dict:
         # Get the AI-generated answer
         answer = results.get("answer") or ""
-        logger.debug(f"[TAVILY] Got answer: {len(answer)} chars")
-        logger.debug(f"[TAVILY] Got {len(results.get('results', []))} source results")
+        logger.debug("[TAVILY] Got answer: %d chars", len(answer))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[TAVILY] Got %d source results", len(results.get("results", [])))
         
         # Collect source snippets for additional context
         sources = []
         content_snippets = []
         
-        for result in results.get("results", [])[:8]:
-            title = result.get("title", "")
-            content = result.get("content", "")
+        for result in results.get("results", [])[:max_results]:
+            result_get = result.get
+            # Slice once; the shorter source snippet is a prefix of it
+            content = (result_get("content") or "")[:_CONTEXT_SNIPPET_CHARS]
             sources.append({
-                "title": title,
-                "snippet": content[:400],
-                "url": result.get("url", ""),
+                "title": result_get("title", ""),
+                "snippet": content[:_SOURCE_SNIPPET_CHARS],
+                "url": result_get("url", ""),
             })
             if content:
-                content_snippets.append(f"- {content[:500]}")
+                content_snippets.append(f"- {content}")
         
         # If no AI answer, build one from snippets
         if not answer and content_snippets:
             answer = f"Pharmacies near {location} for {medicine_name}:\n" + "\n".join(content_snippets[:6])
-            logger.debug(f"[TAVILY] Built fallback answer from snippets: {len(answer)} chars")
+            logger.debug("[TAVILY] Built fallback answer from snippets: %d chars", len(answer))
         
         if not answer:
             return {"success": False, "error": "No pharmacy information found", "use_fallback": True}
@@ -101,67 +201,50 @@ def search_pharmacies_web(
             "sources": sources,  # Raw snippets for additional context
             "search_query": query,
         }
-        
-    except Exception as e:
-        logger.error(f"[TAVILY] Pharmacy search error: {e}")
-        return {"success": False, "error": str(e), "use_fallback": True}
+    
+    return params, shape
 
 
-def search_destination_info(
-    destination: str,
-    interests: list[str] = None,
-) -> dict:
-    """
-    Search for real destination information using web search.
-    Uses include_answer=True to get AI-synthesized content with real place names.
-    Also extracts pricing information when mentioned in search results.
-    """
-    logger.debug(f"[TAVILY] Destination search: {destination}")
-    client = get_tavily_client()
-    
-    if not client:
-        logger.error("[TAVILY] No client available")
-        return {"success": False, "error": "Tavily API key not configured", "use_fallback": True}
-    
+def _destination_search(destination: str, interests: Optional[list[str]], max_results: int) -> SearchPlan:
     interests_str = ", ".join(interests) if interests else "sightseeing, food, culture"
-    logger.debug(f"[TAVILY] Interests: {interests_str}")
+    logger.debug("[TAVILY] Interests: %s", interests_str)
     
-    try:
-        # Build query dynamically based on interests
-        query = f"best {interests_str} in {destination} with prices and costs. Top places to visit, things to do, where to eat. Include entry fees, ticket prices, meal costs in USD."
-        logger.debug(f"[TAVILY] Query: {query}")
-        
-        results = client.search(
-            query=query,
-            search_depth="advanced",
-            max_results=10,
-            include_answer=True,
-        )
-        
+    # Build query dynamically based on interests
+    query = f"best {interests_str} in {destination} with prices and costs. Top places to visit, things to do, where to eat. Include entry fees, ticket prices, meal costs in USD."
+    params = {
+        "query": query,
+        "search_depth": "advanced",
+        "max_results": max_results,
+        "include_answer": True,
+    }
+    
+    def shape(results: dict) -> dict:
         # Get the AI-generated answer (may be None if not available)
         answer = results.get("answer") or ""
-        logger.debug(f"[TAVILY] Got answer: {len(answer)} chars")
-        logger.debug(f"[TAVILY] Got {len(results.get('results', []))} source results")
+        logger.debug("[TAVILY] Got answer: %d chars", len(answer))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[TAVILY] Got %d source results", len(results.get("results", [])))
         
         # Collect source snippets
         sources = []
         content_snippets = []
         
-        for result in results.get("results", [])[:8]:
-            title = result.get("title", "")
-            content = result.get("content", "")
+        for result in results.get("results", [])[:max_results]:
+            result_get = result.get
+            # Slice once; the shorter source snippet is a prefix of it
+            content = (result_get("content") or "")[:_CONTEXT_SNIPPET_CHARS]
             sources.append({
-                "title": title,
-                "snippet": content[:400],  # Include more content for price context
-                "url": result.get("url", ""),
+                "title": result_get("title", ""),
+                "snippet": content[:_SOURCE_SNIPPET_CHARS],  # Include more content for price context
+                "url": result_get("url", ""),
             })
             if content:
-                content_snippets.append(f"- {content[:500]}")
+                content_snippets.append(f"- {content}")
         
         # If no AI answer, build one from snippets
         if not answer and content_snippets:
             answer = f"Here are top places and activities in {destination}:\n" + "\n".join(content_snippets[:6])
-            logger.debug(f"[TAVILY] Built fallback answer from snippets: {len(answer)} chars")
+            logger.debug("[TAVILY] Built fallback answer from snippets: %d chars", len(answer))
         
         if not answer:
             return {"success": False, "error": "No destination information found", "use_fallback": True}
@@ -173,66 +256,47 @@ def search_destination_info(
             "sources": sources,  # Raw snippets with pricing info for LLM to extract
             "search_query": query,
         }
-        
-    except Exception as e:
-        logger.error(f"[TAVILY] Destination search error: {e}")
-        return {"success": False, "error": str(e), "use_fallback": True}
+    
+    return params, shape
 
 
-def search_activities_web(
-    destination: str,
-    activity_type: str,
-    budget: str = "moderate",
-) -> dict:
-    """
-    Search for specific activities at a destination.
-    Uses include_answer=True for AI-synthesized recommendations.
-    """
-    logger.debug(f"[TAVILY] Activity search: {activity_type} in {destination} ({budget})")
-    client = get_tavily_client()
-    
-    if not client:
-        logger.error("[TAVILY] No client available")
-        return {"success": False, "error": "Tavily API key not configured", "use_fallback": True}
-    
-    budget_terms = {
-        "budget": "cheap affordable budget-friendly",
-        "moderate": "mid-range popular recommended",
-        "luxury": "luxury premium high-end exclusive",
+_BUDGET_TERMS = {
+    "budget": "cheap affordable budget-friendly",
+    "moderate": "mid-range popular recommended",
+    "luxury": "luxury premium high-end exclusive",
+}
+
+
+def _activities_search(destination: str, activity_type: str, budget: str, max_results: int) -> SearchPlan:
+    query = f"top 5 {activity_type} places in {destination} {_BUDGET_TERMS.get(budget, '')} with specific names and addresses"
+    params = {
+        "query": query,
+        "search_depth": "advanced",
+        "max_results": max_results,
+        "include_answer": True,  # Get AI-synthesized answer
     }
     
-    try:
-        query = f"top 5 {activity_type} places in {destination} {budget_terms.get(budget, '')} with specific names and addresses"
-        logger.debug(f"[TAVILY] Query: {query}")
-        
-        results = client.search(
-            query=query,
-            search_depth="advanced",
-            max_results=8,
-            include_answer=True,  # Get AI-synthesized answer
-            # Note: Removed include_domains to get broader results
-        )
-        
+    def shape(results: dict) -> dict:
         # Handle None answer
         answer = results.get("answer") or ""
-        logger.debug(f"[TAVILY] Got answer: {len(answer)} chars")
+        logger.debug("[TAVILY] Got answer: %d chars", len(answer))
         
         # Collect sources and build fallback if needed
         sources = []
         content_snippets = []
-        for result in results.get("results", [])[:5]:
-            content = result.get("content", "")
+        for result in results.get("results", [])[:max_results]:
+            result_get = result.get
             sources.append({
-                "title": result.get("title", ""),
-                "url": result.get("url", ""),
+                "title": result_get("title", ""),
+                "url": result_get("url", ""),
             })
-            if content:
+            if content := result_get("content"):
                 content_snippets.append(f"- {content[:300]}")
         
         # If no AI answer, build from snippets
         if not answer and content_snippets:
             answer = f"Top {activity_type} in {destination}:\n" + "\n".join(content_snippets[:5])
-            logger.debug(f"[TAVILY] Built fallback answer: {len(answer)} chars")
+            logger.debug("[TAVILY] Built fallback answer: %d chars", len(answer))
         
         return {
             "success": True,
@@ -241,73 +305,311 @@ def search_activities_web(
             "answer": answer,  # AI-synthesized recommendations
             "sources": sources,
         }
+    
+    return params, shape
+
+
+def _availability_search(pharmacy_name: str, medicine_name: str, location: str, max_results: int) -> SearchPlan:
+    query = f"{pharmacy_name} {location} {medicine_name} availability stock price"
+    params = {
+        "query": query,
+        "search_depth": "basic",
+        "max_results": max_results,
+    }
+    
+    def shape(results: dict) -> dict:
+        items = results.get("results", [])[:max_results]
+        
+        # Extract pricing info if found - only the first 500 chars are kept,
+        # so stop collecting content once that much has been gathered
+        parts = []
+        length = 0
+        for r in items:
+            content = r.get("content") or ""
+            parts.append(content)
+            length += len(content) + 1
+            if length >= _AVAILABILITY_CONTENT_CHARS:
+                break
         
+        return {
+            "success": True,
+            "pharmacy_name": pharmacy_name,
+            "medicine_name": medicine_name,
+            "search_content": " ".join(parts)[:_AVAILABILITY_CONTENT_CHARS],
+            "sources": [r.get("url") for r in items[:3]],
+        }
+    
+    return params, shape
+
+
+# Raw Tavily responses keyed by request parameters, shared by every search plan so
+# identical upstream queries (e.g. the same pharmacy search at a different radius)
+# hit Tavily once. The TTL matches the shortest per-function TTL (availability) so
+# shaped results never outlive their freshness window by reshaping an older response.
+_raw_cache: TTLCache = TTLCache(maxsize=512, ttl=600)
+_raw_lock = threading.Lock()
+_search_caches.append(_raw_cache)
+
+
+def _raw_key(params: dict) -> tuple:
+    return tuple(sorted(params.items()))
+
+
+def _raw_lookup(key: tuple) -> Optional[dict]:
+    with _raw_lock:
+        return _raw_cache.get(key)
+
+
+def _raw_store(key: tuple, results: dict) -> None:
+    # Like cached_search, skip empty responses so a transient miss isn't replayed
+    if not (results.get("answer") or results.get("results")):
+        return
+    with _raw_lock:
+        _raw_cache[key] = results
+
+
+def _run_search_sync(label: str, plan: SearchPlan) -> dict:
+    """Run a search plan with the blocking TavilyClient."""
+    params, shape = plan
+    client = get_tavily_client()
+    
+    if not client:
+        logger.error("[TAVILY] No client available")
+        return {"success": False, "error": "Tavily API key not configured", "use_fallback": True}
+    
+    try:
+        key = _raw_key(params)
+        if (results := _raw_lookup(key)) is None:
+            logger.debug("[TAVILY] Query: %s", params["query"])
+            results = client.search(**params)
+            _raw_store(key, results)
+        return shape(results)
     except Exception as e:
-        logger.error(f"[TAVILY] Activity search error: {e}")
+        logger.error("[TAVILY] %s search error: %s", label, e)
         return {"success": False, "error": str(e), "use_fallback": True}
 
 
+@cached_search()
+def search_pharmacies_web(
+    medicine_name: str,
+    location: str,
+    radius_km: float = 5.0,
+    max_results: int = 5,
+) -> dict:
+    """
+    Search for real pharmacies using web search.
+    Uses include_answer=True to get AI-synthesized content with real pharmacy info.
+    Returns the answer and sources for internal LLM to structure.
+    """
+    logger.debug("[TAVILY] Pharmacy search: %s near %s", medicine_name, location)
+    return _run_search_sync("Pharmacy", _pharmacy_search(medicine_name, location, max_results))
+
+
+@cached_search()
+def search_destination_info(
+    destination: str,
+    interests: list[str] = None,
+    max_results: int = 8,
+) -> dict:
+    """
+    Search for real destination information using web search.
+    Uses include_answer=True to get AI-synthesized content with real place names.
+    Also extracts pricing information when mentioned in search results.
+    """
+    logger.debug("[TAVILY] Destination search: %s", destination)
+    return _run_search_sync("Destination", _destination_search(destination, interests, max_results))
+
+
+@cached_search()
+def search_activities_web(
+    destination: str,
+    activity_type: str,
+    budget: str = "moderate",
+    max_results: int = 5,
+) -> dict:
+    """
+    Search for specific activities at a destination.
+    Uses include_answer=True for AI-synthesized recommendations.
+    """
+    logger.debug("[TAVILY] Activity search: %s in %s (%s)", activity_type, destination, budget)
+    return _run_search_sync("Activity", _activities_search(destination, activity_type, budget, max_results))
+
+
+@cached_search(ttl_seconds=600)  # stock changes faster than place info
 def search_medicine_availability(
     pharmacy_name: str,
     medicine_name: str,
     location: str,
+    max_results: int = 3,
 ) -> dict:
     """
     Search for medicine availability information.
+    Callers only use the first ~500 chars of content, so few results are needed.
     """
-    client = get_tavily_client()
+    return _run_search_sync("Availability", _availability_search(pharmacy_name, medicine_name, location, max_results))
+
+
+# Common US phone formats, e.g. (415) 555-0100, 415.555.0100, 4155550100
+_PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Street names are bounded to 60 chars so each start position does a fixed amount
+# of work; scanning long, untrusted web snippets stays linear in their length
+_ADDRESS_RE = re.compile(
+    r'\d{1,6}\s+[\w\s]{1,60}?(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way)\b',
+    re.IGNORECASE,
+)
+
+
+def extract_phone(text: str) -> str:
+    """Extract phone number from text."""
+    match = _PHONE_RE.search(text)
+    return match.group() if match else "Contact via website"
+
+
+def extract_address(text: str, location: str) -> str:
+    """Extract address from text or return location-based placeholder."""
+    match = _ADDRESS_RE.search(text)
+    return match.group() if match else f"Near {location} (see website for exact address)"
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session for async Tavily requests (created on first use)."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            # Keep warm connections to api.tavily.com so later searches skip the TLS handshake
+            connector=aiohttp.TCPConnector(limit_per_host=TAVILY_CONCURRENCY, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=TAVILY_TIMEOUT_SECONDS),
+        )
+    return _http_session
+
+
+async def close_tavily_client() -> None:
+    """Close the shared Tavily client and HTTP session (call at process shutdown)."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
     
-    if not client:
+    if _create_tavily_client.cache_info().currsize:
+        api_key = _get_tavily_api_key()
+        client = _create_tavily_client(api_key) if api_key else None
+        if (close := getattr(client, "close", None)) is not None:
+            close()
+    _create_tavily_client.cache_clear()
+
+
+async def _run_search_async(label: str, plan: SearchPlan) -> dict:
+    """Run a search plan against Tavily's REST API without blocking the event loop."""
+    params, shape = plan
+    api_key = _get_tavily_api_key()
+    
+    if not api_key:
+        logger.error("[TAVILY] No API key available")
         return {"success": False, "error": "Tavily API key not configured", "use_fallback": True}
     
     try:
-        query = f"{pharmacy_name} {location} {medicine_name} availability stock price"
-        
-        results = client.search(
-            query=query,
-            search_depth="basic",
-            max_results=5,
-        )
-        
-        # Extract pricing info if found
-        content = " ".join([r.get("content", "") for r in results.get("results", [])])
-        
-        return {
-            "success": True,
-            "pharmacy_name": pharmacy_name,
-            "medicine_name": medicine_name,
-            "search_content": content[:500],
-            "sources": [r.get("url") for r in results.get("results", [])][:3],
-        }
-        
+        key = _raw_key(params)
+        if (results := _raw_lookup(key)) is None:
+            logger.debug("[TAVILY] Query: %s", params["query"])
+            async with _TAVILY_SEM:
+                async with get_http_session().post(
+                    TAVILY_SEARCH_URL,
+                    json=params,
+                    headers={"Authorization": f"Bearer {api_key}"},
+                ) as response:
+                    response.raise_for_status()
+                    results = await response.json()
+            _raw_store(key, results)
+        return shape(results)
     except Exception as e:
+        logger.error("[TAVILY] %s search error: %s", label, e)
         return {"success": False, "error": str(e), "use_fallback": True}
 
 
-def extract_phone(text: str) -> str:
-    """Extract phone number from text."""
-    import re
-    # Match common US phone patterns
-    patterns = [
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-        r'\d{3}[-.\s]\d{3}[-.\s]\d{4}',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group()
-    return "Contact via website"
+async def _single_flight(search: Callable[..., dict], fetch: Callable[[], Awaitable[dict]], *args) -> dict:
+    """
+    Serve a search from its cache, or fetch it once while concurrent identical
+    misses wait on the same per-key lock instead of issuing their own request.
+    """
+    key = search.cache_key(*args)
+    if (cached := search.cache_lookup(key)) is not None:
+        logger.debug("[TAVILY] Cache hit: %s", search.__name__)
+        return cached
+    
+    lock = _search_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            # Another caller may have filled the cache while we waited
+            if (cached := search.cache_lookup(key)) is not None:
+                return cached
+            result = await fetch()
+            if result.get("success"):
+                search.cache_store(key, result)
+            return result
+    finally:
+        if not lock.locked():
+            _search_locks.pop(key, None)
 
 
-def extract_address(text: str, location: str) -> str:
-    """Extract address from text or return location-based placeholder."""
-    import re
-    # Try to find address patterns
-    patterns = [
-        r'\d+\s+[\w\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way)',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group()
-    return f"Near {location} (see website for exact address)"
+async def asearch_pharmacies_web(
+    medicine_name: str,
+    location: str,
+    radius_km: float = 5.0,
+    max_results: int = 5,
+) -> dict:
+    """Async variant of search_pharmacies_web."""
+    logger.debug("[TAVILY] Pharmacy search: %s near %s", medicine_name, location)
+    return await _single_flight(
+        search_pharmacies_web,
+        lambda: _run_search_async("Pharmacy", _pharmacy_search(medicine_name, location, max_results)),
+        medicine_name, location, radius_km, max_results,
+    )
+
+
+async def asearch_destination_info(
+    destination: str,
+    interests: list[str] = None,
+    max_results: int = 8,
+) -> dict:
+    """Async variant of search_destination_info."""
+    logger.debug("[TAVILY] Destination search: %s", destination)
+    return await _single_flight(
+        search_destination_info,
+        lambda: _run_search_async("Destination", _destination_search(destination, interests, max_results)),
+        destination, interests, max_results,
+    )
+
+
+async def asearch_activities_web(
+    destination: str,
+    activity_type: str,
+    budget: str = "moderate",
+    max_results: int = 5,
+) -> dict:
+    """Async variant of search_activities_web."""
+    logger.debug("[TAVILY] Activity search: %s in %s (%s)", activity_type, destination, budget)
+    return await _single_flight(
+        search_activities_web,
+        lambda: _run_search_async("Activity", _activities_search(destination, activity_type, budget, max_results)),
+        destination, activity_type, budget, max_results,
+    )
+
+
+async def asearch_medicine_availability(
+    pharmacy_name: str,
+    medicine_name: str,
+    location: str,
+    max_results: int = 3,
+) -> dict:
+    """Async variant of search_medicine_availability."""
+    return await _single_flight(
+        search_medicine_availability,
+        lambda: _run_search_async("Availability", _availability_search(pharmacy_name, medicine_name, location, max_results)),
+        pharmacy_name, medicine_name, location, max_results,
+    )
+
+
+def clear_search_cache() -> None:
+    """Drop all cached search results, including raw Tavily responses."""
+    for cache in _search_caches:
+        cache.clear()
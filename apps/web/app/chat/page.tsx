@@ -547,6 +547,49 @@ export default function UnifiedChatPage() {
     },
   });
 
+  // Render check_availability_batch tool calls - updates left pane for every checked pharmacy
+  useRenderToolCall({
+    name: 'check_availability_batch',
+    render: ({ status, args, result }) => {
+      const isLoading = status !== 'complete';
+      const results: { pharmacy_name: string; in_stock: boolean; price_per_unit?: number | null }[] = result?.results || [];
+      
+      // Update pharmacy stock status in left pane
+      if (status === 'complete' && results.length > 0) {
+        setTimeout(() => {
+          const byName = new Map(results.map(r => [r.pharmacy_name, r]));
+          setState(prev => ({
+            ...prev,
+            medicine: {
+              ...prev.medicine,
+              stage: 'checking_availability',
+              pharmacies: prev.medicine.pharmacies.map(p => {
+                const r = byName.get(p.name);
+                return r ? { ...p, hasStock: r.in_stock, price: r.price_per_unit || null } : p;
+              }),
+            },
+          }));
+        }, 0);
+      }
+      
+      return (
+        <div className="flex items-center gap-2 text-sm py-2 px-3 my-1 rounded-lg border bg-blue-50 border-blue-200">
+          {isLoading ? (
+            <>
+              <Loader2 className="h-4 w-4 animate-spin text-blue-600" />
+              <span>Checking stock at {args?.pharmacy_ids?.length || 'several'} pharmacies...</span>
+            </>
+          ) : result ? (
+            <>
+              <CheckCircle2 className="h-4 w-4 text-emerald-600" />
+              <span>{result.message}</span>
+            </>
+          ) : null}
+        </div>
+      );
+    },
+  });
+
   // Render call_pharmacy tool calls - updates left pane with call result
   useRenderToolCall({
     name: 'call_pharmacy',